@@ -0,0 +1,292 @@
+# aggregations.py  (cálculos de cada panel del dashboard sobre las filas filtradas)
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+# Llaves de los agregados parciales: de ellas se derivan las vistas por producto y por categoría
+PARTIAL_KEYS = ['categoria', 'producto']
+
+# Columnas que acumula el motor (suma y cantidad de valores no nulos por grupo)
+VALUE_COLUMNS = [
+    'unidades_vendidas',
+    'revenue',
+    'precio',
+    'margen_porcentual',
+    'satisfaccion_cliente',
+    'precio_homecenter',
+    'precio_amazon',
+    'precio_mercadolibre',
+]
+
+# Puntajes posibles de satisfacción (se cuentan por grupo para la distribución)
+SATISFACTION_SCORES = [1, 2, 3, 4, 5]
+
+# Columnas aditivas de los agregados parciales (se pueden sumar entre grupos)
+PARTIAL_COLUMNS = (['filas']
+                   + [f'{col}_{stat}' for col in VALUE_COLUMNS for stat in ('sum', 'n')]
+                   + [f'satisfaccion_{score}' for score in SATISFACTION_SCORES])
+
+
+def filter_rows(df: pd.DataFrame, start_d, end_d, selected_cat: str = 'All') -> pd.DataFrame:
+    """Filas dentro del rango de fechas y de la categoría elegida en el sidebar"""
+    mask = df['fecha_venta_dt'].between(pd.to_datetime(start_d), pd.to_datetime(end_d))
+    if selected_cat != 'All':
+        mask &= df['categoria'] == selected_cat
+    return df[mask]
+
+
+# ---------- Versión de referencia: un groupby por panel sobre las filas ----------
+
+def kpis(filtered: pd.DataFrame) -> dict:
+    """Métricas de la fila superior del dashboard"""
+    return {
+        'Total revenue': filtered['revenue'].sum(),
+        'Units sold': int(filtered['unidades_vendidas'].sum()),
+        'Avg ticket': filtered['precio'].mean(),
+        'Unique products': filtered['producto'].nunique()
+    }
+
+
+def top_products_by_units(filtered: pd.DataFrame, n: int = 15) -> pd.DataFrame:
+    """Productos más vendidos por unidades"""
+    return (filtered.groupby('producto', as_index=False, observed=True)
+            .agg({
+                'unidades_vendidas': 'sum',
+                'revenue': 'sum',
+                'precio': 'mean',
+                'categoria': 'first'
+            })
+            .sort_values('unidades_vendidas', ascending=False, kind='stable')
+            .head(n))
+
+
+def product_metrics(filtered: pd.DataFrame, min_units: int = 5) -> pd.DataFrame:
+    """Margen y rotación por producto, descartando productos con menos de `min_units` unidades"""
+    metrics = (filtered.groupby('producto', as_index=False, observed=True)
+               .agg({
+                   'unidades_vendidas': 'sum',
+                   'margen_porcentual': 'mean',
+                   'revenue': 'sum',
+                   'precio': 'mean',
+                   'categoria': 'first'
+               })
+               .rename(columns={'unidades_vendidas': 'tasa_rotacion'}))
+
+    # Filtrar productos con al menos 5 unidades vendidas para evitar outliers
+    return metrics[metrics['tasa_rotacion'] >= min_units]
+
+
+def satisfaction_by_category(filtered: pd.DataFrame) -> pd.DataFrame:
+    """Satisfacción promedio, ventas y revenue por categoría"""
+    satisfaction = (filtered.groupby('categoria', as_index=False, observed=True)
+                    .agg({
+                        'satisfaccion_cliente': ['mean', 'count'],
+                        'revenue': 'sum'
+                    })
+                    .round(2))
+
+    # Flatten column names
+    satisfaction.columns = ['categoria', 'satisfaccion_promedio', 'total_ventas', 'revenue_total']
+    return satisfaction.sort_values('satisfaccion_promedio', ascending=False, kind='stable')
+
+
+def satisfaction_dist(filtered: pd.DataFrame) -> pd.Series:
+    """Cantidad de ventas por puntaje de satisfacción"""
+    return filtered['satisfaccion_cliente'].value_counts().sort_index()
+
+
+def price_comparison(filtered: pd.DataFrame) -> pd.DataFrame:
+    """Precio promedio por canal y diferencias porcentuales contra HomeCenter"""
+    prices = (filtered.groupby('categoria', as_index=False, observed=True)
+              .agg({
+                  'precio_homecenter': 'mean',
+                  'precio_amazon': 'mean',
+                  'precio_mercadolibre': 'mean',
+                  'revenue': 'sum'
+              })
+              .round(0))
+
+    # Calcular diferencias porcentuales
+    prices['diff_amazon_hc'] = ((prices['precio_amazon'] - prices['precio_homecenter']) / prices['precio_homecenter'] * 100).round(1)
+    prices['diff_ml_hc'] = ((prices['precio_mercadolibre'] - prices['precio_homecenter']) / prices['precio_homecenter'] * 100).round(1)
+    return prices
+
+
+# ---------- Motor fusionado: una sola pasada sobre las filas ----------
+
+def _group_codes(rows: pd.DataFrame, keys: list[str]):
+    """Factoriza las llaves una vez: código de grupo por fila y valores de cada llave por grupo"""
+    combined = np.zeros(len(rows), dtype='int64')
+    key_uniques = []
+    for key in keys:
+        codes, uniques = pd.factorize(rows[key])
+        key_uniques.append(uniques)
+        # Código mixto: el nulo (-1) pasa a 0 para que cada llave ocupe [0, len(uniques)]
+        combined = combined * (len(uniques) + 1) + (codes + 1)
+    group_codes, combined_uniques = pd.factorize(combined)
+
+    key_values = {}
+    for key, uniques in zip(reversed(keys), reversed(key_uniques)):
+        idx = combined_uniques % (len(uniques) + 1) - 1
+        combined_uniques = combined_uniques // (len(uniques) + 1)
+        uniques = uniques.array if isinstance(uniques, pd.Index) else uniques
+        key_values[key] = pd.Series(pd.api.extensions.take(uniques, idx, allow_fill=True), dtype=rows[key].dtype)
+    return group_codes, {key: key_values[key] for key in keys}
+
+
+def partial_aggregates(rows: pd.DataFrame, keys: list[str] = PARTIAL_KEYS) -> pd.DataFrame:
+    """Sumas y conteos por grupo de `keys` en una sola pasada sobre `rows`.
+
+    Las llaves se factorizan una vez y cada columna se acumula con `np.bincount`.
+    Los grupos quedan en orden de primera aparición (eso conserva la semántica de
+    'first'); las llaves nulas se conservan porque cuentan en los KPIs.
+    """
+    codes, key_values = _group_codes(rows, keys)
+    n_groups = len(key_values[keys[0]])
+
+    out = pd.DataFrame(key_values)
+    out['filas'] = np.bincount(codes, minlength=n_groups)
+    for col in VALUE_COLUMNS:
+        values = rows[col].to_numpy(dtype='float64', na_value=np.nan)
+        valid = ~np.isnan(values)
+        if valid.all():
+            out[f'{col}_sum'] = np.bincount(codes, weights=values, minlength=n_groups)
+            out[f'{col}_n'] = out['filas']
+        else:
+            out[f'{col}_sum'] = np.bincount(codes[valid], weights=values[valid], minlength=n_groups)
+            out[f'{col}_n'] = np.bincount(codes[valid], minlength=n_groups)
+        if pd.api.types.is_integer_dtype(rows[col]):
+            out[f'{col}_sum'] = out[f'{col}_sum'].astype('int64')
+
+    # Distribución de satisfacción: un solo bincount sobre (grupo, puntaje)
+    n_scores = len(SATISFACTION_SCORES)
+    score_idx = pd.Index(SATISFACTION_SCORES).get_indexer(rows['satisfaccion_cliente'].to_numpy())
+    hit = score_idx >= 0
+    counts = np.bincount(codes[hit] * n_scores + score_idx[hit], minlength=n_groups * n_scores)
+    for i, score in enumerate(SATISFACTION_SCORES):
+        out[f'satisfaccion_{score}'] = counts[i::n_scores]
+    return out
+
+
+def _mean(sums: pd.DataFrame, col: str) -> pd.Series:
+    """Promedio a partir de suma y conteo (NaN si el grupo no tiene valores)"""
+    return sums[f'{col}_sum'] / sums[f'{col}_n'].where(sums[f'{col}_n'] > 0)
+
+
+def _rollup(partials: pd.DataFrame, key: str) -> pd.DataFrame:
+    """Re-agrupa los parciales por `key` (la vista es pequeña: un grupo por producto o categoría)"""
+    return partials.groupby(key, as_index=False, observed=True)[PARTIAL_COLUMNS].sum()
+
+
+def _products(partials: pd.DataFrame) -> pd.DataFrame:
+    """Vista por producto: unidades, revenue, promedios y categoría ('first')"""
+    by_product = _rollup(partials, 'producto')
+    # 'first' ignora nulos: categoría del primer grupo con categoría no nula
+    by_product['categoria'] = (partials.dropna(subset=['categoria'])
+                               .groupby('producto', observed=True)['categoria'].first()
+                               .reindex(by_product['producto']).to_numpy())
+    return pd.DataFrame({
+        'producto': by_product['producto'],
+        'unidades_vendidas': by_product['unidades_vendidas_sum'],
+        'revenue': by_product['revenue_sum'],
+        'precio': _mean(by_product, 'precio'),
+        'margen_porcentual': _mean(by_product, 'margen_porcentual'),
+        'categoria': by_product['categoria'],
+    })
+
+
+def _kpis(partials: pd.DataFrame, unique_products=None) -> dict:
+    """KPIs de los parciales; `unique_products` permite pasar una estimación (sin 'producto')"""
+    return {
+        'Total revenue': float(partials['revenue_sum'].sum()),
+        'Units sold': int(partials['unidades_vendidas_sum'].sum()),
+        'Avg ticket': partials['precio_sum'].sum() / partials['precio_n'].sum() if partials['precio_n'].sum() else np.nan,
+        'Unique products': partials['producto'].nunique() if unique_products is None else unique_products,
+    }
+
+
+def _top_products(products: pd.DataFrame, top_n: int) -> pd.DataFrame:
+    return (products[['producto', 'unidades_vendidas', 'revenue', 'precio', 'categoria']]
+            .sort_values('unidades_vendidas', ascending=False, kind='stable')
+            .head(top_n))
+
+
+def _product_metrics(products: pd.DataFrame, min_units: int) -> pd.DataFrame:
+    metrics = (products[['producto', 'unidades_vendidas', 'margen_porcentual', 'revenue', 'precio', 'categoria']]
+               .rename(columns={'unidades_vendidas': 'tasa_rotacion'}))
+    return metrics[metrics['tasa_rotacion'] >= min_units]
+
+
+def _satisfaction(by_category: pd.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame({
+        'categoria': by_category['categoria'],
+        'satisfaccion_promedio': _mean(by_category, 'satisfaccion_cliente'),
+        'total_ventas': by_category['satisfaccion_cliente_n'],
+        'revenue_total': by_category['revenue_sum'],
+    }).round(2).sort_values('satisfaccion_promedio', ascending=False, kind='stable')
+
+
+def _satisfaction_dist(partials: pd.DataFrame) -> pd.Series:
+    dist = pd.Series({score: partials[f'satisfaccion_{score}'].sum() for score in SATISFACTION_SCORES},
+                     name='count')
+    dist.index.name = 'satisfaccion_cliente'
+    return dist[dist > 0]
+
+
+def _prices(by_category: pd.DataFrame) -> pd.DataFrame:
+    prices = pd.DataFrame({
+        'categoria': by_category['categoria'],
+        'precio_homecenter': _mean(by_category, 'precio_homecenter'),
+        'precio_amazon': _mean(by_category, 'precio_amazon'),
+        'precio_mercadolibre': _mean(by_category, 'precio_mercadolibre'),
+        'revenue': by_category['revenue_sum'],
+    }).round(0)
+    prices['diff_amazon_hc'] = ((prices['precio_amazon'] - prices['precio_homecenter']) / prices['precio_homecenter'] * 100).round(1)
+    prices['diff_ml_hc'] = ((prices['precio_mercadolibre'] - prices['precio_homecenter']) / prices['precio_homecenter'] * 100).round(1)
+    return prices
+
+
+# Paneles que salen de la vista por producto y de la vista por categoría
+PRODUCT_PANELS = {'top_products_by_units', 'product_metrics'}
+CATEGORY_PANELS = {'satisfaction_by_category', 'price_comparison'}
+PANELS = ['kpis', 'top_products_by_units', 'product_metrics', 'satisfaction_by_category',
+          'satisfaction_dist', 'price_comparison']
+
+
+def panels_from_partials(partials: pd.DataFrame, min_units: int = 5, top_n: int = 15,
+                         names: list[str] | None = None) -> dict:
+    """Deriva los paneles `names` (por defecto, todos) de los agregados parciales.
+
+    Las vistas por producto y por categoría solo se arman si algún panel pedido las usa.
+    """
+    names = PANELS if names is None else names
+    products = _products(partials) if PRODUCT_PANELS.intersection(names) else None
+    by_category = _rollup(partials, 'categoria') if CATEGORY_PANELS.intersection(names) else None
+    build = {
+        'kpis': lambda: _kpis(partials),
+        'top_products_by_units': lambda: _top_products(products, top_n),
+        'product_metrics': lambda: _product_metrics(products, min_units),
+        'satisfaction_by_category': lambda: _satisfaction(by_category),
+        'satisfaction_dist': lambda: _satisfaction_dist(partials),
+        'price_comparison': lambda: _prices(by_category),
+    }
+    return {name: build[name]() for name in names}
+
+
+def compute_panels(filtered: pd.DataFrame) -> dict:
+    """Todos los agregados que muestra el dashboard para un filtro dado (una sola pasada)"""
+    return panels_from_partials(partial_aggregates(filtered))
+
+
+def compute_panels_reference(filtered: pd.DataFrame) -> dict:
+    """Mismos agregados con un groupby por panel; se usa para verificar el motor fusionado"""
+    return {
+        'kpis': kpis(filtered),
+        'top_products_by_units': top_products_by_units(filtered),
+        'product_metrics': product_metrics(filtered),
+        'satisfaction_by_category': satisfaction_by_category(filtered),
+        'satisfaction_dist': satisfaction_dist(filtered),
+        'price_comparison': price_comparison(filtered),
+    }
@@ -0,0 +1,336 @@
+# api.py  (API HTTP/JSON de solo lectura con los agregados del dashboard)
+#
+# Uso: python api.py [--host 127.0.0.1] [--port 8502] [--workers 8]
+#
+#   GET /api/kpis
+#   GET /api/top-products?top_n=15
+#   GET /api/margin-rotation?min_units=5
+#   GET /api/satisfaction
+#   GET /api/prices
+#   GET /api/dataset            versión, rango de fechas y categorías
+#
+# Todas las consultas aceptan start=AAAA-MM-DD, end=AAAA-MM-DD y category=<categoría>
+# (por defecto, el rango completo y todas las categorías, como el sidebar). Usa el mismo
+# dataset, motor (DASHBOARD_ENGINE, DASHBOARD_APPROX) y recarga en segundo plano que el
+# dashboard, pero sin Streamlit: una consulta no ejecuta ningún script.
+#
+# Cada respuesta lleva un ETag derivado de la versión del dataset y de la consulta; un
+# cliente que la repite con If-None-Match recibe 304 sin que se calcule ni se envíe
+# nada. Las respuestas se guardan ya serializadas (JSON compacto, con orjson si está
+# instalado, y gzip) en una caché LRU, y consultas iguales simultáneas esperan el primer
+# cálculo en lugar de repetirlo. Las conexiones se atienden con un pool de hilos fijo.
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+import aggregations
+import engines
+import partitions
+import snapshot
+import storage
+from cache import LRUCache
+
+try:
+    import orjson
+except ImportError:  # opcional: json de la biblioteca estándar
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Ruta -> (paneles de aggregations que devuelve, parámetros enteros: (defecto, mín, máx))
+ROUTES = {
+    "kpis": (["kpis"], {}),
+    "top-products": (["top_products_by_units"], {"top_n": (15, 1, 500)}),
+    "margin-rotation": (["product_metrics"], {"min_units": (5, 1, 1_000_000)}),
+    "satisfaction": (["satisfaction_by_category", "satisfaction_dist"], {}),
+    "prices": (["price_comparison"], {}),
+}
+
+# Respuestas más chicas que esto no se comprimen
+GZIP_MIN_BYTES = 1024
+
+
+def _native(value):
+    """Escalar de numpy/pandas como tipo de Python (NaN y NaT como null)"""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, (pd.Timestamp, date)):
+        return value.isoformat()
+    return value
+
+
+def _records(frame: pd.DataFrame) -> list[dict]:
+    return [{col: _native(v) for col, v in row.items()} for row in frame.to_dict("records")]
+
+
+def to_json(panel):
+    """Agregado de aggregations (dict, DataFrame o Series) en tipos serializables"""
+    if isinstance(panel, pd.DataFrame):
+        return _records(panel)
+    if isinstance(panel, pd.Series):
+        return _records(panel.rename(panel.name or "value").reset_index())
+    return {key: _native(value) for key, value in panel.items()}
+
+
+def dumps(obj) -> bytes:
+    """JSON compacto (sin espacios)"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, allow_nan=False).encode("utf-8")
+
+
+class BadRequest(Exception):
+    """Parámetros de la consulta inválidos (400)"""
+
+
+class Response:
+    """Cuerpo serializado de una consulta; la versión gzip se arma al pedirla por primera vez"""
+
+    def __init__(self, body: bytes, etag: str):
+        self.body = body
+        self.etag = etag
+        self._gzipped = None
+
+    def gzipped(self) -> bytes:
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, compresslevel=5)
+        return self._gzipped
+
+
+class QueryService:
+    """Consultas de la API sobre la versión vigente del dataset, con caché de respuestas"""
+
+    def __init__(self, manager: snapshot.SnapshotManager, options: dict, cache_entries: int = 256):
+        self.manager = manager
+        self.options = options
+        self.partials = LRUCache(max_entries=64)
+        self.responses = LRUCache(max_entries=cache_entries)
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+
+    def parse(self, route: str, query: dict, snap: snapshot.Snapshot) -> tuple:
+        """Filtro y parámetros normalizados (ValueError si alguno no es válido)"""
+        min_date, max_date, categories = snap["bounds"]
+        single = {key: values[-1] for key, values in query.items()}
+        start = date.fromisoformat(single["start"]) if "start" in single else min_date.date()
+        end = date.fromisoformat(single["end"]) if "end" in single else max_date.date()
+        if start > end:
+            raise ValueError("start no puede ser posterior a end")
+        category = single.get("category", "All")
+        if category != "All" and category not in categories:
+            raise ValueError(f"Categoría desconocida: {category!r}")
+        params = {}
+        for name, (default, low, high) in ROUTES[route][1].items():
+            value = int(single.get(name, default))
+            if not low <= value <= high:
+                raise ValueError(f"{name} debe estar entre {low} y {high}")
+            params[name] = value
+        return (start, end, category), params
+
+    def etag(self, snap: snapshot.Snapshot, route: str, filters: tuple, params: dict) -> str:
+        """Cambia con el contenido del dataset (no con el número de versión del proceso)"""
+        key = repr((snap.source, self.options, route, filters, sorted(params.items())))
+        return f'W/"{hashlib.sha1(key.encode()).hexdigest()[:20]}"'
+
+    def _panels(self, snap: snapshot.Snapshot, route: str, filters: tuple, params: dict) -> dict:
+        names = ROUTES[route][0]
+        if names == ["kpis"] and "sketches" in snap.resources:
+            return {"kpis": snap["sketches"].kpis(*filters)}
+        partials = self.partials.get_or_compute(
+            (snap.version,) + filters, lambda: engines.partials(snap.resources, *filters))
+        return aggregations.panels_from_partials(partials, names=names, **params)
+
+    def _payload(self, snap: snapshot.Snapshot, route: str, filters: tuple, params: dict) -> dict:
+        panels = self._panels(snap, route, filters, params)
+        data = {name: to_json(panel) for name, panel in panels.items()}
+        if route == "margin-rotation":
+            # Líneas de referencia de los cuadrantes del gráfico
+            metrics = panels["product_metrics"]
+            data["medians"] = {col: _native(metrics[col].median()) for col in ("tasa_rotacion", "margen_porcentual")}
+        start, end, category = filters
+        return {
+            "version": snap.version,
+            "filters": {"start": start.isoformat(), "end": end.isoformat(), "category": category, **params},
+            "data": data,
+        }
+
+    def dataset(self, snap: snapshot.Snapshot) -> Response:
+        min_date, max_date, categories = snap["bounds"]
+        body = dumps({"version": snap.version, "engine": self.options["engine"],
+                      "approximate": self.options["approximate"], "min_date": min_date.isoformat(),
+                      "max_date": max_date.isoformat(), "categories": categories})
+        return Response(body, self.etag(snap, "dataset", (), {}))
+
+    def response(self, snap: snapshot.Snapshot, route: str, filters: tuple, params: dict) -> Response:
+        """Respuesta en caché o calculada; una sola vez para consultas iguales simultáneas"""
+        key = (snap.version, route, filters, tuple(sorted(params.items())))
+        with self._inflight_lock:
+            lock = self._inflight.setdefault(key, threading.Lock())
+        try:
+            with lock:
+                return self.responses.get_or_compute(key, lambda: Response(
+                    dumps(self._payload(snap, route, filters, params)), self.etag(snap, route, filters, params)))
+        finally:
+            with self._inflight_lock:
+                if self._inflight.get(key) is lock:
+                    del self._inflight[key]
+
+
+class Handler(BaseHTTPRequestHandler):
+    server_version = "dashboard-api"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        parts = url.path.strip("/").split("/")
+        if len(parts) != 2 or parts[0] != "api" or (parts[1] not in ROUTES and parts[1] != "dataset"):
+            self._error(404, f"Ruta desconocida: {url.path}")
+            return
+        # La respuesta se arma completa antes de enviar nada: un error siempre llega como JSON
+        try:
+            response = self._response(parts[1], parse_qs(url.query))
+        except BadRequest as exc:
+            self._error(400, str(exc))
+            return
+        except Exception as exc:
+            logger.exception("error al responder %s", self.path)
+            self._error(500, f"Error interno al responder la consulta ({type(exc).__name__})")
+            return
+        self._send(response)
+
+    def _response(self, route: str, query: dict) -> Response:
+        service = self.server.service
+        # Una sola versión del dataset para toda la consulta
+        snap = service.manager.current()
+        if route == "dataset":
+            return service.dataset(snap)
+        try:
+            filters, params = service.parse(route, query, snap)
+        except ValueError as exc:
+            raise BadRequest(str(exc)) from exc
+        etag = service.etag(snap, route, filters, params)
+        if self._not_modified(etag):
+            # `_send` responde 304 sin cuerpo: no hace falta calcular nada
+            return Response(b"", etag)
+        return service.response(snap, route, filters, params)
+
+    def _not_modified(self, etag: str) -> bool:
+        header = self.headers.get("If-None-Match")
+        if not header:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+        return "*" in tags or etag.removeprefix("W/") in tags
+
+    def _send_headers(self, status: int, etag: str, length: int | None = None, encoding: str | None = None):
+        self.send_response(status)
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        if length is not None:
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(length))
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.end_headers()
+
+    def _send(self, response: Response):
+        if self._not_modified(response.etag):
+            self._send_headers(304, response.etag)
+            return
+        body, encoding = response.body, None
+        if len(body) >= GZIP_MIN_BYTES and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body, encoding = response.gzipped(), "gzip"
+        self._send_headers(200, response.etag, len(body), encoding)
+        self.wfile.write(body)
+
+    def _error(self, status: int, message: str):
+        body = dumps({"error": message})
+        self.send_response(status)
+        # Los errores no se guardan en cachés intermedias: el próximo intento se recalcula
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTPServer que atiende cada conexión en un pool de `workers` hilos"""
+
+    request_queue_size = 256
+
+    def __init__(self, address, service: QueryService, workers: int):
+        super().__init__(address, Handler)
+        self.service = service
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api")
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+
+def make_server(path: str, host: str = "127.0.0.1", port: int = 8502, workers: int = 8,
+                options: dict | None = None, interval: float = snapshot.INTERVAL) -> PooledHTTPServer:
+    """Servidor listo para `serve_forever`, con la primera versión del dataset ya cargada"""
+    options = options or engines.options_from_env()
+    cache = partitions.PartitionCache()
+    manager = snapshot.SnapshotManager(path, lambda p: engines.build(p, partition_cache=cache, **options),
+                                       interval=interval)
+    service = QueryService(manager, options, cache_entries=int(os.environ.get("DASHBOARD_API_ENTRIES", 256)))
+    return PooledHTTPServer((host, port), service, workers)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="API HTTP/JSON con los agregados del dashboard")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--workers", type=int, default=8, help="Hilos que atienden conexiones")
+    parser.add_argument("--dataset", default=None, help="Dataset a servir (por defecto, el que usa el dashboard)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    server = make_server(args.dataset or storage.find_dataset("data_aug"), args.host, args.port, args.workers,
+                         interval=float(os.environ.get("DASHBOARD_REFRESH_SECONDS", snapshot.INTERVAL)))
+    print(f"🌐 API en http://{args.host}:{server.server_port}/api/ "
+          f"({args.workers} hilos, JSON con {'orjson' if orjson else 'json'})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.service.manager.stop()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,20 @@
+import functools
+import os
+
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 from datetime import datetime
 
+import aggregations
+import charts
+import engines
+import partitions
+import profiling
+import snapshot
+import sketches
+import storage
+from cache import LRUCache
+
 # ------------------ PAGE CONFIG ------------------
 st.set_page_config(
     page_title='Sales Intelligence Dashboard',
@@ -24,404 +36,302 @@ st.markdown(
     unsafe_allow_html=True)
 
 # -------------- DATA LOADING --------------------
-@st.cache_data
-def load_data(path: str = 'data_aug.csv') -> pd.DataFrame:
-    df = pd.read_csv(path, sep='\t', encoding='latin1')
-    df['fecha_venta_dt'] = pd.to_datetime(df['fecha_venta'], dayfirst=True, errors='coerce')
-    df['revenue'] = df['precio'] * df['unidades_vendidas']
-    df['month'] = df['fecha_venta_dt'].dt.to_period('M').astype(str)
-    df['week']  = df['fecha_venta_dt'].dt.to_period('W-MON').apply(lambda r: r.start_time.strftime('%Y-%m-%d'))
-    df['day']   = df['fecha_venta_dt'].dt.strftime('%Y-%m-%d')
-    
-    # Calcular margen de ganancia (simulado)
-    df['costo_estimado'] = df['precio'] * 0.65  # 65% del precio como costo estimado
-    df['margen_ganancia'] = df['precio'] - df['costo_estimado']
-    df['margen_porcentual'] = (df['margen_ganancia'] / df['precio']) * 100
-    
-    return df.dropna(subset=['fecha_venta_dt'])
-
-df = load_data()
+# Ruta absoluta: es la llave de la caché compartida por todo el proceso
+DATA_PATH = os.path.abspath(storage.find_dataset('data_aug'))
+
+# -------------- PROFILING -----------------------
+# DASHBOARD_PROFILE=1 o el interruptor del sidebar: tiempo de cada etapa, aciertos de
+# caché y memoria del dataset, en un panel desplegable y como líneas JSON en el log
+# 'dashboard.profile'
+def profile_enabled() -> bool:
+    return os.environ.get('DASHBOARD_PROFILE') == '1' or st.session_state.get('profile', False)
+
+def show_profile(profiler: profiling.Profiler, title: str):
+    with st.expander(f'⏱️ {title}: {profiler.total_ms():,.0f} ms'):
+        st.dataframe(profiler.summary(), use_container_width=True, hide_index=True)
+
+def profiled(name: str):
+    """Etapa para un fragmento; si se re-ejecuta solo, abre y muestra su propio perfil"""
+    def wrap(fn):
+        @functools.wraps(fn)
+        def run():
+            owner = None if profiling.current() else profiling.start(name, profile_enabled())
+            with profiling.stage(f'fragment:{name}'):
+                fn()
+            if owner:
+                show_profile(owner, f'Perfil de {name}')
+                owner.finish()
+        return run
+    return wrap
+
+profiler = profiling.start('page', profile_enabled())
+
+# DASHBOARD_ENGINE: 'rollup' (cubo diario, por defecto) y 'rows' (filas del rango vía
+# índice) trabajan sobre el DataFrame en memoria; 'scan' consulta los archivos en disco
+# por cada filtro y nunca carga las filas (datasets más grandes que la RAM).
+# DASHBOARD_APPROX=1: los KPIs salen de totales por (categoría, día) y 'Unique products'
+# se estima con HyperLogLog (precisión DASHBOARD_HLL_PRECISION); solo motores en memoria
+OPTIONS = engines.options_from_env()
+APPROXIMATE, HLL_PRECISION = OPTIONS['approximate'], OPTIONS['precision']
+
+@st.cache_resource
+def snapshots(path: str) -> snapshot.SnapshotManager:
+    # Un único dataset de solo lectura compartido por todas las sesiones; la llave es
+    # solo `path` (siempre explícito: los valores por defecto no entran en la llave
+    # de st.cache_resource) y cada versión se detecta en el SnapshotManager. Las versiones
+    # nuevas se arman en segundo plano (DASHBOARD_REFRESH_SECONDS entre revisiones) y
+    # ninguna ejecución del script espera una recarga.
+    with profiling.stage('snapshots.compute'):
+        cache = partitions.PartitionCache()
+        return snapshot.SnapshotManager(
+            path, lambda p: engines.build(p, partition_cache=cache, **OPTIONS),
+            interval=float(os.environ.get('DASHBOARD_REFRESH_SECONDS', snapshot.INTERVAL)))
+
+@st.cache_resource
+def panel_cache() -> LRUCache:
+    # Agregados por filtro compartidos entre sesiones; tamaño y TTL configurables
+    ttl = os.environ.get('DASHBOARD_CACHE_TTL')
+    return LRUCache(max_entries=int(os.environ.get('DASHBOARD_CACHE_ENTRIES', 64)),
+                    ttl=float(ttl) if ttl else None)
+
+# Versión del dataset para toda esta ejecución (y los fragmentos que se re-ejecuten
+# después): si se publica otra, la toma la próxima ejecución completa
+manager = profiling.resource('snapshots', lambda: snapshots(DATA_PATH))
+snap = manager.current()
+
+min_date, max_date, categories = snap['bounds']
+if profiler and 'df' in snap.resources:
+    profiler.record('dataset', 0.0, rows=len(snap['df']), df_mb=profiling.memory_mb(snap['df']),
+                    version=snap.version)
 
 # ---------------- SIDEBAR FILTERS ---------------
-st.sidebar.header('🔎 Filters')
-min_date, max_date = df['fecha_venta_dt'].min(), df['fecha_venta_dt'].max()
-start_d, end_d = st.sidebar.date_input('Select date range', (min_date, max_date), min_value=min_date, max_value=max_date)
-
-category_options = ['All'] + sorted(df['categoria'].dropna().unique())
-selected_cat = st.sidebar.selectbox('Category', category_options)
-
-# Apply filters
-mask = df['fecha_venta_dt'].between(pd.to_datetime(start_d), pd.to_datetime(end_d))
-if selected_cat != 'All':
-    mask &= df['categoria'] == selected_cat
-filtered = df[mask]
+with profiling.stage('sidebar'):
+    st.sidebar.header('🔎 Filters')
+    start_d, end_d = st.sidebar.date_input('Select date range', (min_date, max_date), min_value=min_date, max_value=max_date)
+
+    category_options = ['All'] + categories
+    selected_cat = st.sidebar.selectbox('Category', category_options)
+
+# Apply filters: los agregados parciales del filtro y cada panel se reutilizan si ya
+# se calcularon para la misma combinación de fechas, categoría y versión del dataset
+FILTER_KEY = (start_d, end_d, selected_cat, DATA_PATH, snap.version)
+
+def compute_partials() -> pd.DataFrame:
+    return engines.partials(snap.resources, start_d, end_d, selected_cat)
+
+def panel(name: str, **params):
+    # Cada panel se deriva recién cuando una sección visible lo pide
+    partials = profiling.cached('partials', panel_cache(), FILTER_KEY + ('partials',), compute_partials)
+    return profiling.cached(
+        f'panel:{name}', panel_cache(), FILTER_KEY + (name, tuple(sorted(params.items()))),
+        lambda: aggregations.panels_from_partials(partials, names=[name], **params)[name])
+
+def kpis() -> dict:
+    if not APPROXIMATE:
+        return panel('kpis')
+    return profiling.cached('panel:kpis', panel_cache(), FILTER_KEY + ('kpis', HLL_PRECISION),
+                            lambda: snap['sketches'].kpis(start_d, end_d, selected_cat))
+
+# ---------- FIGURAS Y TABLAS -------------------
+# Cada panel se construye a partir de su agregado y se reutiliza (entre reruns y
+# sesiones) mientras el contenido del agregado no cambie
+TABLE_FORMAT = os.environ.get('DASHBOARD_TABLE_FORMAT', 'column_config')
+
+@st.cache_resource
+def render_cache() -> LRUCache:
+    return LRUCache(max_entries=int(os.environ.get('DASHBOARD_RENDER_ENTRIES', 256)))
+
+def render(name: str, build, data):
+    return profiling.cached(f'render:{name}', render_cache(), (name, charts.digest(data)), lambda: build(data))
+
+def show_chart(name: str, fig):
+    with profiling.stage(f'chart:{name}'):
+        st.plotly_chart(fig, use_container_width=True)
+
+def show_table(name: str, data: pd.DataFrame, select=None):
+    # `select` elige las filas a mostrar (p. ej. un top 10) antes de formatear
+    build = lambda d: charts.table(name, select(d) if select else d, TABLE_FORMAT)
+    if TABLE_FORMAT == 'styler':
+        # El Styler se arma en cada rerun: st.dataframe lo modifica al renderizarlo
+        table, formats = build(data)
+    else:
+        table, formats = render(f'table:{name}', build, data)
+    with profiling.stage(f'table:{name}'):
+        st.dataframe(table,
+                     column_config={col: st.column_config.NumberColumn(format=fmt) for col, fmt in formats.items()},
+                     use_container_width=True)
+
+with st.sidebar.expander('⚙️ Cache'):
+    st.caption(f"Datos · versión {snap.version} · cargada {datetime.fromtimestamp(snap.loaded_at):%H:%M:%S}")
+    if manager.error:
+        st.caption(f"⚠️ No se pudo cargar la versión nueva: {manager.error}")
+    for label, cache in (('Agregados', panel_cache()), ('Figuras y tablas', render_cache())):
+        cache_stats = cache.stats()
+        st.caption(f"{label} · Hits: {cache_stats['hits']} · Misses: {cache_stats['misses']} · "
+                   f"Evictions: {cache_stats['evictions']} · "
+                   f"Entries: {cache_stats['entries']}/{cache_stats['max_entries']}")
 
 # ---------- METRICS ROW -------------------------
-col1, col2, col3, col4 = st.columns(4)
-metrics = {
-    'Total revenue': filtered['revenue'].sum(),
-    'Units sold': int(filtered['unidades_vendidas'].sum()),
-    'Avg ticket': filtered['precio'].mean(),
-    'Unique products': filtered['producto'].nunique()
-}
-for col,(k,v) in zip([col1,col2,col3,col4],metrics.items()):
-    with col:
-        st.markdown(f"""
-        <div class='metric-card'>
-            <h3>{k}</h3>
-            <h2>{v:,.0f}</h2>
-        </div>
-        """,unsafe_allow_html=True)
+with profiling.stage('metrics'):
+    col1, col2, col3, col4 = st.columns(4)
+    metrics = kpis()
+    for col,(k,v) in zip([col1,col2,col3,col4],metrics.items()):
+        with col:
+            st.markdown(f"""
+            <div class='metric-card'>
+                <h3>{k}</h3>
+                <h2>{v:,.0f}</h2>
+            </div>
+            """,unsafe_allow_html=True)
+    if APPROXIMATE:
+        st.caption(f"Unique products estimado con HyperLogLog "
+                   f"(error típico ±{sketches.standard_error(HLL_PRECISION):.1%})")
 
 st.divider()
 
 # ---------- LISTA DE PRODUCTOS ------------------
-st.subheader('📦 Lista de productos')
-st.markdown("""
-**Descripción:** Con este gráfico, realizado a partir del dataset obtenido después del Webscraping, 
-se busca corroborar cuales son los productos mas vendidos actualmente en el mercado.
-""")
-
-# Obtener los productos más vendidos por unidades
-top_products_by_units = (filtered.groupby('producto', as_index=False)
-                        .agg({
-                            'unidades_vendidas': 'sum',
-                            'revenue': 'sum',
-                            'precio': 'mean',
-                            'categoria': 'first'
-                        })
-                        .sort_values('unidades_vendidas', ascending=False)
-                        .head(15))
-
-# Crear el gráfico de barras horizontal
-fig_products = px.bar(
-    top_products_by_units,
-    x='unidades_vendidas',
-    y='producto',
-    orientation='h',
-    color='categoria',
-    title='Top 15 Productos Más Vendidos por Unidades',
-    labels={'unidades_vendidas': 'Unidades Vendidas', 'producto': 'Producto'},
-    hover_data=['revenue', 'precio']
-)
-
-fig_products.update_layout(
-    height=600,
-    margin=dict(l=0, r=0, t=40, b=0),
-    xaxis_title='Unidades Vendidas',
-    yaxis_title='Producto',
-    showlegend=True
-)
-
-# Mejorar la presentación del gráfico
-fig_products.update_traces(
-    texttemplate='%{x:,}',
-    textposition='outside'
-)
-
-st.plotly_chart(fig_products, use_container_width=True)
-
-# Mostrar tabla detallada
-st.subheader('📊 Detalle de Productos Más Vendidos')
-st.dataframe(
-    top_products_by_units[['producto', 'unidades_vendidas', 'revenue', 'precio', 'categoria']]
-    .rename(columns={
-        'producto': 'Producto',
-        'unidades_vendidas': 'Unidades Vendidas',
-        'revenue': 'Revenue Total',
-        'precio': 'Precio Promedio',
-        'categoria': 'Categoría'
-    })
-    .style.format({
-        'Unidades Vendidas': '{:,.0f}',
-        'Revenue Total': '${:,.0f}',
-        'Precio Promedio': '${:,.0f}'
-    }),
-    use_container_width=True
-)
-
-st.divider()
+@st.fragment
+@profiled('products')
+def products_section():
+    st.subheader('📦 Lista de productos')
+    st.markdown("""
+    **Descripción:** Con este gráfico, realizado a partir del dataset obtenido después del Webscraping, 
+    se busca corroborar cuales son los productos mas vendidos actualmente en el mercado.
+    """)
+
+    # Obtener los productos más vendidos por unidades
+    top_n = st.slider('Productos a mostrar', 5, 50, 15, key='top_n')
+    top_products_by_units = panel('top_products_by_units', top_n=top_n)
+
+    # Crear el gráfico de barras horizontal
+    show_chart('products', render(f'products:{top_n}', lambda d: charts.products_figure(d, top_n),
+                                  top_products_by_units))
+
+    # Mostrar tabla detallada
+    st.subheader('📊 Detalle de Productos Más Vendidos')
+    show_table('top_products', top_products_by_units)
 
 # ---------- PRODUCTOS CON MAYOR MARGEN Y ROTACIÓN ------------------
-st.subheader('💰 Productos con mayor margen de ganancia y tasa de rotación')
-st.markdown("""
-**Descripción:** Este análisis identifica los productos que combinan altos márgenes de ganancia con una 
-excelente tasa de rotación de inventario. Los productos en el cuadrante superior derecho representan las 
-mejores oportunidades comerciales, ya que generan mayor rentabilidad por unidad vendida y se venden 
-frecuentemente, optimizando el retorno de inversión del inventario.
-""")
-
-# Calcular métricas por producto
-product_metrics = (filtered.groupby('producto', as_index=False)
-                  .agg({
-                      'unidades_vendidas': 'sum',
-                      'margen_porcentual': 'mean',
-                      'revenue': 'sum',
-                      'precio': 'mean',
-                      'categoria': 'first'
-                  })
-                  .rename(columns={'unidades_vendidas': 'tasa_rotacion'}))
-
-# Filtrar productos con al menos 5 unidades vendidas para evitar outliers
-product_metrics = product_metrics[product_metrics['tasa_rotacion'] >= 5]
-
-# Crear gráfico de dispersión
-fig_margin_rotation = px.scatter(
-    product_metrics,
-    x='margen_porcentual',
-    y='tasa_rotacion',
-    size='revenue',
-    color='categoria',
-    hover_name='producto',
-    title='Margen de Ganancia vs Tasa de Rotación',
-    labels={
-        'margen_porcentual': 'Margen de Ganancia (%)',
-        'tasa_rotacion': 'Tasa de Rotación (Unidades Vendidas)',
-        'revenue': 'Revenue Total'
-    },
-    hover_data=['precio', 'revenue']
-)
-
-# Mejorar el diseño del gráfico
-fig_margin_rotation.update_layout(
-    height=600,
-    margin=dict(l=0, r=0, t=40, b=0),
-    xaxis_title='Margen de Ganancia (%)',
-    yaxis_title='Tasa de Rotación (Unidades Vendidas)',
-    showlegend=True
-)
-
-# Agregar líneas de referencia para los cuadrantes
-fig_margin_rotation.add_hline(
-    y=product_metrics['tasa_rotacion'].median(),
-    line_dash="dash",
-    line_color="gray",
-    annotation_text="Mediana Rotación"
-)
-
-fig_margin_rotation.add_vline(
-    x=product_metrics['margen_porcentual'].median(),
-    line_dash="dash", 
-    line_color="gray",
-    annotation_text="Mediana Margen"
-)
-
-st.plotly_chart(fig_margin_rotation, use_container_width=True)
-
-# Mostrar top productos por margen y rotación
-col_margin, col_rotation = st.columns(2)
-
-with col_margin:
-    st.subheader('🏆 Top 10 por Margen de Ganancia')
-    top_margin = product_metrics.nlargest(10, 'margen_porcentual')[['producto', 'margen_porcentual', 'tasa_rotacion', 'revenue', 'categoria']]
-    st.dataframe(
-        top_margin.rename(columns={
-            'producto': 'Producto',
-            'margen_porcentual': 'Margen (%)',
-            'tasa_rotacion': 'Rotación',
-            'revenue': 'Revenue',
-            'categoria': 'Categoría'
-        }).style.format({
-            'Margen (%)': '{:.1f}%',
-            'Rotación': '{:,.0f}',
-            'Revenue': '${:,.0f}'
-        }),
-        use_container_width=True
-    )
-
-with col_rotation:
-    st.subheader('⚡ Top 10 por Tasa de Rotación')
-    top_rotation = product_metrics.nlargest(10, 'tasa_rotacion')[['producto', 'tasa_rotacion', 'margen_porcentual', 'revenue', 'categoria']]
-    st.dataframe(
-        top_rotation.rename(columns={
-            'producto': 'Producto',
-            'tasa_rotacion': 'Rotación',
-            'margen_porcentual': 'Margen (%)',
-            'revenue': 'Revenue',
-            'categoria': 'Categoría'
-        }).style.format({
-            'Rotación': '{:,.0f}',
-            'Margen (%)': '{:.1f}%',
-            'Revenue': '${:,.0f}'
-        }),
-        use_container_width=True
-    )
-
-st.divider()
+@st.fragment
+@profiled('margin')
+def margin_section():
+    st.subheader('💰 Productos con mayor margen de ganancia y tasa de rotación')
+    st.markdown("""
+    **Descripción:** Este análisis identifica los productos que combinan altos márgenes de ganancia con una 
+    excelente tasa de rotación de inventario. Los productos en el cuadrante superior derecho representan las 
+    mejores oportunidades comerciales, ya que generan mayor rentabilidad por unidad vendida y se venden 
+    frecuentemente, optimizando el retorno de inversión del inventario.
+    """)
+
+    # Calcular métricas por producto
+    # (se descartan productos con menos de `min_units` unidades vendidas para evitar outliers)
+    min_units = st.slider('Unidades mínimas por producto', 1, 50, 5, key='min_units')
+    product_metrics = panel('product_metrics', min_units=min_units)
+
+    # Crear gráfico de dispersión: SVG, WebGL o grilla de densidad según la cantidad de
+    # productos, con el JSON enviado al navegador acotado (ver charts.py)
+    fig_margin_rotation, scatter_info = render('margin_rotation', charts.margin_rotation_figure, product_metrics)
+
+    show_chart('margin_rotation', fig_margin_rotation)
+    st.caption(f"Modo: {scatter_info['mode']} · {scatter_info['points']:,} de {scatter_info['products']:,} "
+               f"productos como puntos · {scatter_info['payload_bytes'] / 1024:,.0f} KB enviados")
+
+    # Mostrar top productos por margen y rotación
+    col_margin, col_rotation = st.columns(2)
+
+    with col_margin:
+        st.subheader('🏆 Top 10 por Margen de Ganancia')
+        show_table('top_margin', product_metrics, lambda m: m.nlargest(10, 'margen_porcentual'))
+
+    with col_rotation:
+        st.subheader('⚡ Top 10 por Tasa de Rotación')
+        show_table('top_rotation', product_metrics, lambda m: m.nlargest(10, 'tasa_rotacion'))
 
 # ---------- SATISFACCIÓN DEL CLIENTE ------------------
-st.subheader('😊 Satisfacción del cliente según el tipo de producto')
-st.markdown("""
-**Descripción:** Este análisis evalúa la satisfacción del cliente a través de puntajes de 1 a 5 estrellas, 
-permitiendo identificar qué categorías de productos generan mayor satisfacción entre los consumidores. 
-Esta información es crucial para optimizar el portafolio de productos y mejorar la experiencia del cliente, 
-identificando oportunidades de mejora y productos que superan las expectativas del mercado.
-""")
-
-# Calcular satisfacción promedio por categoría
-satisfaction_by_category = (filtered.groupby('categoria', as_index=False)
-                          .agg({
-                              'satisfaccion_cliente': ['mean', 'count'],
-                              'revenue': 'sum'
-                          })
-                          .round(2))
-
-# Flatten column names
-satisfaction_by_category.columns = ['categoria', 'satisfaccion_promedio', 'total_ventas', 'revenue_total']
-satisfaction_by_category = satisfaction_by_category.sort_values('satisfaccion_promedio', ascending=False)
-
-# Crear gráfico de barras para satisfacción por categoría
-fig_satisfaction = px.bar(
-    satisfaction_by_category,
-    x='categoria',
-    y='satisfaccion_promedio',
-    color='satisfaccion_promedio',
-    title='Satisfacción Promedio por Categoría de Producto',
-    labels={'satisfaccion_promedio': 'Satisfacción Promedio (1-5)', 'categoria': 'Categoría'},
-    color_continuous_scale='RdYlGn'
-)
-
-fig_satisfaction.update_layout(
-    height=500,
-    margin=dict(l=0, r=0, t=40, b=0),
-    xaxis_title='Categoría',
-    yaxis_title='Satisfacción Promedio',
-    showlegend=False
-)
-
-# Agregar valores en las barras
-fig_satisfaction.update_traces(
-    texttemplate='%{y:.2f}',
-    textposition='outside'
-)
-
-st.plotly_chart(fig_satisfaction, use_container_width=True)
-
-# Mostrar distribución de satisfacción
-col_sat1, col_sat2 = st.columns(2)
-
-with col_sat1:
-    st.subheader('📊 Distribución de Satisfacción')
-    satisfaction_dist = filtered['satisfaccion_cliente'].value_counts().sort_index()
-    
-    fig_dist = px.pie(
-        values=satisfaction_dist.values,
-        names=[f'{i} Estrellas' for i in satisfaction_dist.index],
-        title='Distribución de Puntajes de Satisfacción'
-    )
-    fig_dist.update_layout(margin=dict(l=0, r=0, t=40, b=0))
-    st.plotly_chart(fig_dist, use_container_width=True)
-
-with col_sat2:
-    st.subheader('🏆 Top Categorías por Satisfacción')
-    st.dataframe(
-        satisfaction_by_category[['categoria', 'satisfaccion_promedio', 'total_ventas', 'revenue_total']]
-        .rename(columns={
-            'categoria': 'Categoría',
-            'satisfaccion_promedio': 'Satisfacción',
-            'total_ventas': 'Total Ventas',
-            'revenue_total': 'Revenue Total'
-        })
-        .style.format({
-            'Satisfacción': '{:.2f}',
-            'Total Ventas': '{:,.0f}',
-            'Revenue Total': '${:,.0f}'
-        }),
-        use_container_width=True
-    )
-
-st.divider()
+@st.fragment
+@profiled('satisfaction')
+def satisfaction_section():
+    st.subheader('😊 Satisfacción del cliente según el tipo de producto')
+    st.markdown("""
+    **Descripción:** Este análisis evalúa la satisfacción del cliente a través de puntajes de 1 a 5 estrellas, 
+    permitiendo identificar qué categorías de productos generan mayor satisfacción entre los consumidores. 
+    Esta información es crucial para optimizar el portafolio de productos y mejorar la experiencia del cliente, 
+    identificando oportunidades de mejora y productos que superan las expectativas del mercado.
+    """)
+
+    # Calcular satisfacción promedio por categoría
+    satisfaction_by_category = panel('satisfaction_by_category')
+
+    # Crear gráfico de barras para satisfacción por categoría
+    show_chart('satisfaction', render('satisfaction', charts.satisfaction_figure, satisfaction_by_category))
+
+    # Mostrar distribución de satisfacción
+    col_sat1, col_sat2 = st.columns(2)
+
+    with col_sat1:
+        st.subheader('📊 Distribución de Satisfacción')
+        satisfaction_dist = panel('satisfaction_dist')
+        show_chart('satisfaction_dist',
+                   render('satisfaction_dist', charts.satisfaction_dist_figure, satisfaction_dist))
+
+    with col_sat2:
+        st.subheader('🏆 Top Categorías por Satisfacción')
+        show_table('satisfaction', satisfaction_by_category)
 
 # ---------- DIFERENCIA DE PRECIOS ENTRE CANALES ------------------
-st.subheader('🛒 Diferencia de precio entre canales: HomeCenter vs Amazon vs MercadoLibre')
-st.markdown("""
-**Descripción:** Este análisis compara los precios de los mismos productos entre diferentes canales de venta, 
-permitiendo identificar oportunidades de arbitraje y entender la estrategia de precios de cada plataforma. 
-La información ayuda a optimizar la estrategia de distribución y pricing, identificando qué canal ofrece 
-mejores precios para diferentes categorías de productos y cómo esto afecta la competitividad del mercado.
-""")
-
-# Calcular diferencias de precios por categoría
-price_comparison = (filtered.groupby('categoria', as_index=False)
-                   .agg({
-                       'precio_homecenter': 'mean',
-                       'precio_amazon': 'mean',
-                       'precio_mercadolibre': 'mean',
-                       'revenue': 'sum'
-                   })
-                   .round(0))
-
-# Calcular diferencias porcentuales
-price_comparison['diff_amazon_hc'] = ((price_comparison['precio_amazon'] - price_comparison['precio_homecenter']) / price_comparison['precio_homecenter'] * 100).round(1)
-price_comparison['diff_ml_hc'] = ((price_comparison['precio_mercadolibre'] - price_comparison['precio_homecenter']) / price_comparison['precio_homecenter'] * 100).round(1)
-
-# Crear gráfico de comparación de precios
-fig_price_comparison = px.bar(
-    price_comparison,
-    x='categoria',
-    y=['precio_homecenter', 'precio_amazon', 'precio_mercadolibre'],
-    title='Comparación de Precios Promedio por Canal',
-    labels={'value': 'Precio Promedio ($)', 'variable': 'Canal', 'categoria': 'Categoría'},
-    barmode='group'
-)
-
-fig_price_comparison.update_layout(
-    height=600,
-    margin=dict(l=0, r=0, t=40, b=0),
-    xaxis_title='Categoría',
-    yaxis_title='Precio Promedio ($)',
-    showlegend=True
-)
+@st.fragment
+@profiled('prices')
+def prices_section():
+    st.subheader('🛒 Diferencia de precio entre canales: HomeCenter vs Amazon vs MercadoLibre')
+    st.markdown("""
+    **Descripción:** Este análisis compara los precios de los mismos productos entre diferentes canales de venta, 
+    permitiendo identificar oportunidades de arbitraje y entender la estrategia de precios de cada plataforma. 
+    La información ayuda a optimizar la estrategia de distribución y pricing, identificando qué canal ofrece 
+    mejores precios para diferentes categorías de productos y cómo esto afecta la competitividad del mercado.
+    """)
+
+    # Calcular diferencias de precios por categoría
+    # (incluye diferencias porcentuales contra HomeCenter)
+    price_comparison = panel('price_comparison')
+
+    # Crear gráfico de comparación de precios
+    show_chart('price_comparison', render('price_comparison', charts.price_comparison_figure, price_comparison))
+
+    # Mostrar diferencias porcentuales
+    col_price1, col_price2 = st.columns(2)
+
+    with col_price1:
+        st.subheader('📈 Diferencias vs HomeCenter')
+        # Gráfico de diferencias porcentuales
+        show_chart('price_diff', render('price_diff', charts.price_diff_figure, price_comparison))
+
+    with col_price2:
+        st.subheader('💰 Resumen de Precios por Canal')
+        show_table('prices', price_comparison)
+
+
+# ---------- SECCIONES ------------------
+# Solo se ejecuta la sección elegida: su cálculo, figuras y tablas. Cambiar de sección
+# o un filtro propio de la sección vuelve a ejecutar solo este fragmento, no la página.
+SECTIONS = {
+    '📦 Productos': products_section,
+    '💰 Margen y rotación': margin_section,
+    '😊 Satisfacción': satisfaction_section,
+    '🛒 Precios por canal': prices_section,
+}
 
-st.plotly_chart(fig_price_comparison, use_container_width=True)
-
-# Mostrar diferencias porcentuales
-col_price1, col_price2 = st.columns(2)
-
-with col_price1:
-    st.subheader('📈 Diferencias vs HomeCenter')
-    
-    # Gráfico de diferencias porcentuales
-    fig_diff = px.bar(
-        price_comparison,
-        x='categoria',
-        y=['diff_amazon_hc', 'diff_ml_hc'],
-        title='Diferencias de Precio vs HomeCenter (%)',
-        labels={'value': 'Diferencia (%)', 'variable': 'Canal', 'categoria': 'Categoría'},
-        barmode='group'
-    )
-    
-    fig_diff.update_layout(
-        height=400,
-        margin=dict(l=0, r=0, t=40, b=0),
-        xaxis_title='Categoría',
-        yaxis_title='Diferencia (%)',
-        showlegend=True
-    )
-    
-    # Agregar línea de referencia en 0%
-    fig_diff.add_hline(y=0, line_dash="dash", line_color="red", annotation_text="Precio HomeCenter")
-    
-    st.plotly_chart(fig_diff, use_container_width=True)
-
-with col_price2:
-    st.subheader('💰 Resumen de Precios por Canal')
-    st.dataframe(
-        price_comparison[['categoria', 'precio_homecenter', 'precio_amazon', 'precio_mercadolibre', 'diff_amazon_hc', 'diff_ml_hc']]
-        .rename(columns={
-            'categoria': 'Categoría',
-            'precio_homecenter': 'HomeCenter',
-            'precio_amazon': 'Amazon',
-            'precio_mercadolibre': 'MercadoLibre',
-            'diff_amazon_hc': 'Diff Amazon',
-            'diff_ml_hc': 'Diff ML'
-        })
-        .style.format({
-            'HomeCenter': '${:,.0f}',
-            'Amazon': '${:,.0f}',
-            'MercadoLibre': '${:,.0f}',
-            'Diff Amazon': '{:+.1f}%',
-            'Diff ML': '{:+.1f}%'
-        }),
-        use_container_width=True
-    )
+@st.fragment
+@profiled('analysis')
+def analysis():
+    section = st.radio('Sección', list(SECTIONS), horizontal=True, label_visibility='collapsed', key='section')
+    SECTIONS[section]()
+
+analysis()
+
+# ---------- PERFILADO ------------------
+st.sidebar.toggle('🐞 Perfilado', key='profile',
+                  help='Tiempos por etapa, aciertos de caché y memoria de esta ejecución')
+if profiler:
+    with st.sidebar:
+        show_profile(profiler, 'Perfil de la página')
+    profiler.finish()
@@ -0,0 +1,148 @@
+# bench_api.py  (prueba de carga local de la API HTTP)
+#
+# Uso: python benchmarks/bench_api.py [filas] [clientes] [segundos]
+# Levanta api.py en un puerto libre sobre un dataset sintético, verifica cada ruta
+# contra aggregations y luego lanza `clientes` hilos que repiten una mezcla fija de
+# consultas (rutas × filtros) durante `segundos`. Reporta req/s, p50/p99 y aciertos de
+# caché en tres fases: caché fría, caché caliente y clientes que revalidan con
+# If-None-Match (304 sin cuerpo).
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlencode
+
+import numpy as np
+
+import common  # noqa: F401  (agrega la raíz del repositorio a sys.path)
+
+import aggregations
+import api
+import ingest
+import rollup
+import storage
+from testkit import http_get, synthetic_sales
+
+WORKERS = 8
+
+
+def query_mix(df, n_filters: int = 12, seed: int = 0) -> list:
+    """Rutas de la API sobre `n_filters` filtros (rango de fechas y, a veces, categoría)"""
+    rng = np.random.default_rng(seed)
+    days = np.sort(df["fecha_venta_dt"].dt.normalize().unique())
+    categories = sorted(df["categoria"].unique())
+    paths = []
+    for _ in range(n_filters):
+        start, end = np.sort(rng.integers(0, len(days), 2))
+        params = {"start": str(days[start])[:10], "end": str(days[end])[:10]}
+        if rng.random() < 0.5:
+            params["category"] = categories[rng.integers(len(categories))]
+        paths += [f"/api/{route}?{urlencode(params)}" for route in api.ROUTES]
+    return paths
+
+
+def check(port: int, df, cube) -> None:
+    """Cada ruta contra los paneles calculados directamente, y los errores esperados"""
+    days = np.sort(df["fecha_venta_dt"].dt.normalize().unique())
+    start, end, cat = days[len(days) // 3], days[2 * len(days) // 3], sorted(df["categoria"].unique())[0]
+    params = urlencode({"start": str(start)[:10], "end": str(end)[:10], "category": cat})
+    panels = aggregations.panels_from_partials(rollup.slice_cube(cube, start, end, cat), top_n=10)
+
+    status, _, body = http_get(port, f"/api/kpis?{params}")
+    assert status == 200
+    for key, value in panels["kpis"].items():
+        assert np.isclose(body["data"]["kpis"][key], value), key
+    status, _, body = http_get(port, f"/api/top-products?{params}&top_n=10")
+    assert [r["producto"] for r in body["data"]["top_products_by_units"]] == \
+        panels["top_products_by_units"]["producto"].tolist()
+    _, _, body = http_get(port, f"/api/margin-rotation?{params}")
+    assert len(body["data"]["product_metrics"]) == len(panels["product_metrics"])
+    _, _, body = http_get(port, f"/api/satisfaction?{params}")
+    assert sum(r["count"] for r in body["data"]["satisfaction_dist"]) == panels["satisfaction_dist"].sum()
+    _, _, body = http_get(port, f"/api/prices?{params}")
+    assert len(body["data"]["price_comparison"]) == len(panels["price_comparison"])
+
+    status, headers, _ = http_get(port, f"/api/kpis?{params}")
+    assert http_get(port, f"/api/kpis?{params}", {"If-None-Match": headers["ETag"]})[0] == 304
+    assert http_get(port, "/api/kpis?start=2020-13-01")[0] == 400
+    assert http_get(port, "/api/kpis?category=Nada")[0] == 400
+    assert http_get(port, "/api/nada")[0] == 404
+
+
+def load(port: int, paths: list, clients: int, seconds: float, revalidate: bool = False) -> dict:
+    """`clients` hilos recorriendo `paths` durante `seconds`; latencias y estados"""
+    latencies, statuses, etags = [], [], {}
+    stop = threading.Event()
+    lock = threading.Lock()
+
+    def run(offset: int):
+        i = offset
+        while not stop.is_set():
+            path = paths[i % len(paths)]
+            headers = {"Accept-Encoding": "gzip"}
+            if revalidate and path in etags:
+                headers["If-None-Match"] = etags[path]
+            t0 = time.perf_counter()
+            status, resp_headers, _ = http_get(port, path, headers)
+            with lock:
+                latencies.append((time.perf_counter() - t0) * 1000)
+                statuses.append(status)
+                etags[path] = resp_headers["ETag"]
+            i += 1
+
+    threads = [threading.Thread(target=run, args=(k * len(paths) // clients,)) for k in range(clients)]
+    t0 = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return {"elapsed": time.perf_counter() - t0, "latencies": np.array(latencies), "statuses": statuses}
+
+
+def phase(label: str, service: api.QueryService, port: int, paths: list, clients: int, seconds: float,
+          revalidate: bool = False) -> None:
+    before = service.responses.stats()
+    result = load(port, paths, clients, seconds, revalidate)
+    after = service.responses.stats()
+    hits, misses = after["hits"] - before["hits"], after["misses"] - before["misses"]
+    lat = result["latencies"]
+    not_modified = result["statuses"].count(304)
+    print(f"{label:>16}: {len(lat) / result['elapsed']:7.0f} req/s | p50 {np.percentile(lat, 50):6.1f} ms | "
+          f"p99 {np.percentile(lat, 99):6.1f} ms | 304: {not_modified / len(lat):4.0%} | "
+          f"caché {hits} aciertos / {misses} cálculos")
+
+
+def main(n_rows: int, clients: int, seconds: float) -> None:
+    df = ingest.enrich(synthetic_sales(n_rows))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "data_aug.parquet")
+        storage.write_dataset(df, path)
+        server = api.make_server(path, port=0, workers=WORKERS,
+                                 options={"engine": "rollup", "approximate": False, "precision": 12})
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        port = server.server_port
+        try:
+            check(port, df, rollup.build_cube(storage.compact(df)))
+            paths = query_mix(df)
+            print(f"{n_rows:,} filas, {len(paths)} consultas distintas, {clients} clientes, {WORKERS} hilos, "
+                  f"JSON con {'orjson' if api.orjson else 'json'}")
+            service = server.service
+            service.responses.clear()
+            phase("caché fría", service, port, paths, clients, seconds)
+            phase("caché caliente", service, port, paths, clients, seconds)
+            phase("If-None-Match", service, port, paths, clients, seconds, revalidate=True)
+        finally:
+            server.shutdown()
+            server.server_close()
+            server.service.manager.stop()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 16,
+         float(sys.argv[3]) if len(sys.argv) > 3 else 5.0)
@@ -0,0 +1,64 @@
+# bench_generate.py  (generador paralelo de data_convert.py)
+#
+# Uso: python benchmarks/bench_generate.py [filas] [max_workers]
+# Genera el mismo dataset particionado con 1, 2, 4, ... procesos, compara el tiempo
+# (filas/s y aceleración contra 1 proceso) y verifica que todas las corridas
+# producen exactamente el mismo dataset.
+
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+import common  # noqa: F401  (agrega la raíz del repositorio a sys.path)
+
+import data_convert
+import partitions
+import storage
+from testkit import synthetic_sales
+
+# Columnas originales de data.csv (el resto las agrega data_convert.py)
+SOURCE_COLUMNS = ["fecha_venta", "producto", "categoria", "precio", "unidades_vendidas", "fuente_trafico"]
+
+
+def worker_counts(max_workers: int) -> list:
+    counts = [1]
+    while counts[-1] * 2 <= max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+    return counts
+
+
+def main(n_rows: int, max_workers: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        source = synthetic_sales(5000)[SOURCE_COLUMNS]
+        source["fecha_venta"] = source["fecha_venta"].dt.strftime("%d/%m/%Y")
+        source_path = os.path.join(tmp, "data.csv")
+        source.to_csv(source_path, index=False, **storage.CSV_OPTIONS)
+
+        expected, base = None, None
+        for workers in worker_counts(max_workers):
+            output = os.path.join(tmp, f"data_aug_{workers}")
+            t0 = time.perf_counter()
+            data_convert.generate_parallel(source_path, n_rows, seed=42, workers=workers, output=output)
+            elapsed = time.perf_counter() - t0
+            base = base or elapsed
+
+            df, cube = partitions.PartitionCache().load(output)
+            assert len(df) == n_rows, (len(df), n_rows)
+            if expected is None:
+                expected = (df, cube)
+            else:
+                pd.testing.assert_frame_equal(expected[0], df)
+                pd.testing.assert_frame_equal(expected[1], cube)
+            print(f"{workers:>3} procesos: {elapsed:6.1f} s  {n_rows / elapsed:>12,.0f} filas/s  "
+                  f"x{base / elapsed:.2f}")
+    print(f"✅ mismo dataset con {', '.join(map(str, worker_counts(max_workers)))} procesos")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count())
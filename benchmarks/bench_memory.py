@@ -0,0 +1,64 @@
+# bench_memory.py  (memoria del dataset compactado y verificación de agregados)
+#
+# Uso: python benchmarks/bench_memory.py [filas]
+# Compara cada agregado que muestra el dashboard antes y después de `storage.compact`
+# y falla si alguno cambia.
+
+import sys
+
+import pandas as pd
+
+import common  # noqa: F401  (agrega la raíz del repositorio a sys.path)
+
+import aggregations
+import ingest
+import storage
+from testkit import synthetic_sales
+
+PANELS = ["top_products_by_units", "product_metrics", "satisfaction_by_category", "satisfaction_dist", "price_comparison"]
+
+
+def _comparable(obj):
+    """Normaliza tipos (category/int8/float32) para comparar solo valores"""
+    obj = obj.reset_index(drop=True)
+    if isinstance(obj, pd.Series):
+        return obj.astype("float64")
+    return obj.apply(lambda s: s.astype(str) if not pd.api.types.is_numeric_dtype(s) else s.astype("float64"))
+
+
+def check_aggregates(original: pd.DataFrame, compacted: pd.DataFrame) -> int:
+    """Compara todos los paneles en varios filtros; devuelve la cantidad de comparaciones"""
+    days = original["fecha_venta_dt"].sort_values().unique()
+    filters = [(days[0], days[-1], "All"), (days[len(days) // 3], days[2 * len(days) // 3], "All")]
+    filters += [(days[0], days[-1], cat) for cat in sorted(original["categoria"].unique())[:3]]
+    checks = 0
+    for start, end, cat in filters:
+        subsets = []
+        for df in (original, compacted):
+            mask = df["fecha_venta_dt"].between(start, end)
+            if cat != "All":
+                mask &= df["categoria"] == cat
+            subsets.append(df[mask])
+        assert aggregations.kpis(subsets[0]) == aggregations.kpis(subsets[1]), (start, end, cat)
+        for panel in PANELS:
+            a, b = (getattr(aggregations, panel)(s) for s in subsets)
+            if isinstance(a, pd.Series):
+                pd.testing.assert_series_equal(_comparable(a), _comparable(b), check_names=False)
+            else:
+                pd.testing.assert_frame_equal(_comparable(a), _comparable(b))
+            checks += 1
+    return checks
+
+
+def main(n_rows: int) -> None:
+    # Texto como object, igual que una importación CSV sin compactar
+    original = ingest.enrich(synthetic_sales(n_rows).astype({c: object for c in storage.CATEGORICAL_COLUMNS}))
+    compacted = storage.compact(original)
+    report = storage.memory_report(original, compacted)
+    print(f"memoria: {report['before_mb']:.1f} MB -> {report['after_mb']:.1f} MB (ahorro {report['saved_mb']:.1f} MB)")
+    print("tipos:", {c: str(t) for c, t in compacted.dtypes.items()})
+    print(f"✅ {check_aggregates(original, compacted)} agregados idénticos")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
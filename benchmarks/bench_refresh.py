@@ -0,0 +1,110 @@
+# bench_refresh.py  (latencia de las consultas mientras se recarga el dataset)
+#
+# Uso: python benchmarks/bench_refresh.py [filas]
+# Simula sesiones que consultan paneles sin pausa mientras el dataset se reescribe.
+# Compara la recarga dentro de la consulta (lo que pasaba al cambiar la versión de
+# cache_resource: la primera sesión paga la carga y el cubo, y las demás esperan) con
+# snapshot.SnapshotManager, que arma la versión nueva en segundo plano.
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+import common  # noqa: F401  (agrega la raíz del repositorio a sys.path)
+
+import dataset
+import ingest
+import rollup
+import snapshot
+import storage
+from testkit import synthetic_sales
+
+INTERVAL = 0.1
+
+
+def build(path: str) -> dict:
+    df = dataset.freeze(ingest.load_dataset(path))
+    return {"df": df, "cube": dataset.freeze(rollup.build_cube(df))}
+
+
+def query(resources: dict) -> None:
+    """Un filtro típico: un mes de una categoría"""
+    cube = resources["cube"]
+    end = cube["dia"].iloc[-1]
+    rollup.compute_panels(cube, end - np.timedelta64(30, "D"), end, cube["categoria"].iloc[0])
+
+
+def sessions(current, stop: threading.Event, n: int = 2, think: float = 0.05) -> tuple:
+    """`n` hilos consultando la versión que devuelve `current()` con `think` segundos
+    entre consultas; devuelve los hilos y la lista de latencias en ms"""
+    latencies = []
+
+    def run():
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            query(current())
+            latencies.append((time.perf_counter() - t0) * 1000)
+            time.sleep(think)
+
+    threads = [threading.Thread(target=run) for _ in range(n)]
+    for thread in threads:
+        thread.start()
+    return threads, latencies
+
+
+def report(label: str, latencies: list, extra: str) -> None:
+    lat = np.array(latencies)
+    print(f"{label:>22}: {len(lat):4d} consultas | p50 {np.percentile(lat, 50):7.1f} ms | "
+          f"p99 {np.percentile(lat, 99):7.1f} ms | máx {lat.max():7.1f} ms | {extra}")
+
+
+def main(n_rows: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "data_aug.parquet")
+        versions = [ingest.enrich(synthetic_sales(n_rows, seed=seed)) for seed in (0, 1, 2)]
+        storage.write_dataset(versions[0], path)
+
+        # Recarga en la consulta: la versión se revisa en cada consulta, como en cada rerun
+        lock, state = threading.Lock(), {"source": storage.dataset_version(path), "data": build(path)}
+
+        def blocking():
+            with lock:
+                source = storage.dataset_version(path)
+                if source != state["source"]:
+                    state["source"], state["data"] = source, build(path)
+                return state["data"]
+
+        stop = threading.Event()
+        threads, latencies = sessions(blocking, stop)
+        time.sleep(0.5)
+        storage.write_dataset(versions[1], path)
+        time.sleep(3.0)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        report("recarga en la consulta", latencies, "las sesiones esperan la carga")
+
+        # Recarga en segundo plano con reemplazo atómico
+        manager = snapshot.SnapshotManager(path, build, interval=INTERVAL)
+        stop = threading.Event()
+        threads, latencies = sessions(lambda: manager.current().resources, stop)
+        time.sleep(0.5)
+        storage.write_dataset(versions[2], path)
+        t0 = time.perf_counter()
+        while manager.current().version == 1:
+            time.sleep(0.01)
+        published = time.perf_counter() - t0
+        time.sleep(max(0.0, 3.0 - published))
+        stop.set()
+        for thread in threads:
+            thread.join()
+        manager.stop()
+        report("snapshot en segundo plano", latencies, f"versión 2 publicada a los {published:.2f} s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
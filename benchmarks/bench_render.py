@@ -0,0 +1,68 @@
+# bench_render.py  (construcción de figuras y tablas por rerun vs caché por agregado)
+#
+# Uso: python benchmarks/bench_render.py [filas]
+# Para cada panel compara construir la figura o la tabla desde cero con lo que cuesta
+# un acierto de caché (el hash del agregado), y el formato de tablas con pandas
+# Styler contra column_config.
+
+import sys
+import time
+
+import common  # noqa: F401  (agrega la raíz del repositorio a sys.path)
+
+import aggregations
+import charts
+import ingest
+import storage
+from testkit import synthetic_sales
+
+FIGURES = {
+    'products': (charts.products_figure, 'top_products_by_units'),
+    'margin_rotation': (charts.margin_rotation_figure, 'product_metrics'),
+    'satisfaction': (charts.satisfaction_figure, 'satisfaction_by_category'),
+    'satisfaction_dist': (charts.satisfaction_dist_figure, 'satisfaction_dist'),
+    'price_comparison': (charts.price_comparison_figure, 'price_comparison'),
+    'price_diff': (charts.price_diff_figure, 'price_comparison'),
+}
+
+# Tabla -> (agregado, filas que muestra el dashboard)
+TABLES = {
+    'top_products': ('top_products_by_units', None),
+    'top_margin': ('product_metrics', lambda m: m.nlargest(10, 'margen_porcentual')),
+    'top_rotation': ('product_metrics', lambda m: m.nlargest(10, 'tasa_rotacion')),
+    'satisfaction': ('satisfaction_by_category', None),
+    'prices': ('price_comparison', None),
+}
+
+
+def timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t0) * 1000
+
+
+def main(n_rows: int) -> None:
+    df = storage.compact(ingest.enrich(synthetic_sales(n_rows)))
+    panels = aggregations.compute_panels(df)
+
+    total_build, total_hit = 0.0, 0.0
+    for name, (build, key) in FIGURES.items():
+        data = panels[key]
+        build_ms = timed(lambda: build(data))
+        hit_ms = timed(lambda: charts.digest(data))
+        total_build, total_hit = total_build + build_ms, total_hit + hit_ms
+        print(f"{name:>18}: construir {build_ms:7.1f} ms | acierto de caché {hit_ms:5.2f} ms")
+
+    for name, (key, select) in TABLES.items():
+        data = select(panels[key]) if select else panels[key]
+        # Styler: formatear todas las celdas, como hace st.dataframe al recibirlo
+        styler_ms = timed(lambda: charts.table(name, data, 'styler')[0].to_html())
+        config_ms = timed(lambda: charts.table(name, data))
+        total_build, total_hit = total_build + styler_ms, total_hit + timed(lambda: charts.digest(data))
+        print(f"{'tabla ' + name:>18}: Styler {styler_ms:7.1f} ms | column_config {config_ms:5.2f} ms")
+
+    print(f"por rerun: {total_build:.0f} ms construyendo todo, {total_hit:.1f} ms con todo en caché")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,60 @@
+# bench_rollup.py  (filtro sobre filas vs consulta al cubo diario)
+#
+# Uso: python benchmarks/bench_rollup.py [filas]
+# Verifica que el cubo da los mismos paneles que recorrer las filas (incluidos
+# `nunique` de productos y el mínimo de 5 unidades de product_metrics) para varios
+# rangos de fechas y categorías, y compara tiempos por filtro.
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import common  # noqa: F401  (agrega la raíz del repositorio a sys.path)
+
+import aggregations
+import ingest
+import rollup
+import storage
+from testkit import assert_same_panels, synthetic_sales
+
+
+def filters(df: pd.DataFrame) -> list:
+    days = df['fecha_venta_dt'].dt.normalize().sort_values().unique()
+    cats = sorted(df['categoria'].dropna().unique())
+    return [
+        (days[0], days[-1], 'All'),
+        (days[10], days[40], 'All'),
+        (days[50], days[50], 'All'),
+        (days[0], days[-1], cats[0]),
+        (days[20], days[90], cats[1]),
+    ]
+
+
+def main(n_rows: int) -> None:
+    raw = synthetic_sales(n_rows)
+    # Algunas ventas con hora para ejercitar el borde de la fecha final
+    raw.loc[raw.index[::7], 'fecha_venta'] += pd.Timedelta(hours=15)
+    df = storage.compact(ingest.enrich(raw))
+
+    t0 = time.perf_counter()
+    cube = rollup.build_cube(df)
+    build = time.perf_counter() - t0
+    print(f"cubo: {len(cube):,} filas ({len(cube) / len(df):.1%} de {len(df):,}) en {build:.2f} s")
+
+    row_times, cube_times = [], []
+    for start, end, cat in filters(df):
+        t0 = time.perf_counter()
+        expected = aggregations.compute_panels_reference(aggregations.filter_rows(df, start, end, cat))
+        row_times.append(time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        actual = rollup.compute_panels(cube, start, end, cat)
+        cube_times.append(time.perf_counter() - t0)
+        assert_same_panels(expected, actual)
+    print(f"✅ {len(row_times)} filtros idénticos")
+    print(f"por filtro: filas {np.mean(row_times) * 1000:.0f} ms, cubo {np.mean(cube_times) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
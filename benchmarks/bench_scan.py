@@ -0,0 +1,97 @@
+# bench_scan.py  (motor en memoria vs consultas sobre los archivos con scan.ScanEngine)
+#
+# Uso: python benchmarks/bench_scan.py [filas]
+# Escribe un dataset sintético como un único Parquet y como dataset particionado (en
+# tres ingestas), verifica que ambos motores den los mismos paneles en varios filtros y
+# compara tiempos por filtro y el pico de memoria de un proceso que atiende un filtro.
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from common import peak_rss_mb
+
+import aggregations
+import dataset
+import ingest
+import partitions
+import scan
+import storage
+from testkit import assert_same_panels, synthetic_sales
+
+
+def load_pandas(path: str):
+    if storage.detect_format(path) == "partitioned":
+        return partitions.PartitionCache().load(path)[0]
+    return dataset.freeze(ingest.load_dataset(path))
+
+
+def filters(engine: scan.ScanEngine) -> list:
+    """Todo el rango, un mes, un trimestre de una categoría y un día"""
+    low, high = engine.min_date.normalize(), engine.max_date.normalize()
+    mid = (low + (high - low) / 2).normalize()
+    return [
+        (low, high, "All"),
+        (mid, mid + np.timedelta64(30, "D"), "All"),
+        (low, low + np.timedelta64(90, "D"), engine.categories[0]),
+        (mid, mid, engine.categories[-1]),
+    ]
+
+
+def timed(fn) -> tuple:
+    t0 = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - t0) * 1000
+
+
+def memory(engine: str, path: str) -> None:
+    """Proceso hijo: carga con `engine`, responde el filtro completo e imprime el pico de RSS"""
+    if engine == "scan":
+        source = scan.ScanEngine(path)
+        aggregations.panels_from_partials(source.partials(source.min_date, source.max_date))
+    else:
+        df = load_pandas(path)
+        aggregations.compute_panels(df)
+    print(peak_rss_mb())
+
+
+def main(n_rows: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        raw = synthetic_sales(n_rows)
+        single = os.path.join(tmp, "data_aug.parquet")
+        storage.write_dataset(ingest.enrich(raw), single)
+        partitioned = os.path.join(tmp, "data_aug")
+        for chunk in np.array_split(np.arange(n_rows), 3):
+            partitions.append(partitioned, raw.iloc[chunk])
+        del raw
+
+        for label, path in (("un archivo", single), ("particionado", partitioned)):
+            df, load_ms = timed(lambda: load_pandas(path))
+            engine, scan_ms = timed(lambda: scan.ScanEngine(path))
+            print(f"\n{label}: carga en memoria {load_ms:,.0f} ms | metadatos del scan {scan_ms:,.0f} ms")
+            for start, end, cat in filters(engine):
+                expected, pandas_ms = timed(
+                    lambda: aggregations.compute_panels(aggregations.filter_rows(df, start, end, cat)))
+                actual, query_ms = timed(lambda: aggregations.panels_from_partials(engine.partials(start, end, cat)))
+                assert_same_panels(expected, actual)
+                print(f"  {start:%Y-%m-%d} a {end:%Y-%m-%d} {cat:>12}: pandas {pandas_ms:7.1f} ms | "
+                      f"scan {query_ms:7.1f} ms  (iguales)")
+            del df
+
+            peaks = {}
+            for name in ("pandas", "scan"):
+                out = subprocess.run([sys.executable, __file__, "--memory", name, path],
+                                     capture_output=True, text=True, check=True).stdout
+                peaks[name] = float(out.split()[-1])
+            print(f"  pico de RSS de un proceso: pandas {peaks['pandas']:,.0f} MB | scan {peaks['scan']:,.0f} MB")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--memory":
+        memory(sys.argv[2], sys.argv[3])
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,54 @@
+# bench_scatter.py  (dispersión margen vs rotación con catálogos grandes)
+#
+# Uso: python benchmarks/bench_scatter.py [productos ...]
+# Para cada tamaño de catálogo compara el JSON de un marcador por producto (el gráfico
+# original) con el modo que elige charts.margin_rotation_figure, y verifica que el
+# modo de densidad conserva como puntos los productos de mayor revenue.
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import common  # noqa: F401  (agrega la raíz del repositorio a sys.path)
+
+import charts
+
+
+def product_metrics(n_products: int, seed: int = 0) -> pd.DataFrame:
+    """Métricas por producto con la forma de aggregations.product_metrics"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'producto': [f'Producto {i:07d}' for i in range(n_products)],
+        'tasa_rotacion': rng.integers(5, 2000, n_products),
+        'margen_porcentual': rng.normal(35, 4, n_products),
+        'revenue': rng.lognormal(14, 1.2, n_products),
+        'precio': rng.uniform(5e3, 2e6, n_products),
+        'categoria': rng.choice(['Herramientas', 'Pinturas', 'Iluminación', 'Baños', 'Cocinas'], n_products),
+    })
+
+
+def main(sizes: list) -> None:
+    for n in sizes:
+        metrics = product_metrics(n)
+        t0 = time.perf_counter()
+        full = charts._points(metrics, 'webgl').to_json()
+        full_time = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        fig, info = charts.margin_rotation_figure(metrics)
+        build = time.perf_counter() - t0
+        assert info['payload_bytes'] <= charts.SCATTER_MAX_PAYLOAD, info
+
+        if info['mode'] == 'density':
+            shown = set(np.concatenate([trace.hovertext for trace in fig.data if trace.type == 'scattergl']))
+            top = set(metrics.nlargest(info['points'], 'revenue')['producto'])
+            assert shown == top, 'faltan outliers por revenue'
+
+        print(f"{n:>9,} productos: un punto por producto {len(full) / 2**20:6.1f} MB ({full_time:.2f} s) | "
+              f"{info['mode']:>7}: {info['payload_bytes'] / 2**20:5.2f} MB, {info['points']:,} puntos ({build:.2f} s)")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [2_000, 20_000, 200_000, 1_000_000])
@@ -0,0 +1,50 @@
+# bench_sections.py  (latencia por interacción con secciones perezosas)
+#
+# Uso: python benchmarks/bench_sections.py [filas]
+# Ejecuta app.py con streamlit.testing sobre un dataset sintético y mide la carga
+# inicial y cada cambio de sección, la primera vez (calcula solo esa sección) y al
+# volver (todo en caché). streamlit.testing vuelve a ejecutar el script completo en
+# cada interacción; en el navegador solo se re-ejecuta el fragmento de la sección,
+# así que estos tiempos son una cota superior.
+
+import os
+import sys
+import tempfile
+import time
+
+from streamlit.testing.v1 import AppTest
+
+import common  # noqa: F401  (agrega la raíz del repositorio a sys.path)
+
+import ingest
+import storage
+from testkit import synthetic_sales
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+
+
+def timed_run(at: AppTest) -> float:
+    t0 = time.perf_counter()
+    at.run()
+    assert not at.exception, [e.value for e in at.exception]
+    return (time.perf_counter() - t0) * 1000
+
+
+def main(n_rows: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        storage.write_dataset(ingest.enrich(synthetic_sales(n_rows)), os.path.join(tmp, 'data_aug.parquet'))
+        os.chdir(tmp)
+        at = AppTest.from_file(APP, default_timeout=600)
+        print(f"carga inicial (dataset + KPIs + primera sección): {timed_run(at):,.0f} ms")
+
+        sections = at.radio(key='section').options
+        for label in ('primera visita', 'visita en caché'):
+            times = []
+            for section in sections[1:] + sections[:1]:
+                at.radio(key='section').set_value(section)
+                times.append(timed_run(at))
+            print(f"{label:>16}: " + ' | '.join(f"{s} {t:,.0f} ms" for s, t in zip(sections[1:] + sections[:1], times)))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
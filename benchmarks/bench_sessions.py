@@ -0,0 +1,60 @@
+# bench_sessions.py  (RSS con N sesiones simuladas: copia por sesión vs dataset compartido)
+#
+# Uso: python benchmarks/bench_sessions.py [filas] [sesiones]
+# "copy" reproduce st.cache_data (cada rerun deserializa su propia copia del DataFrame);
+# "shared" reproduce st.cache_resource + dataset.freeze (todas las sesiones ven los
+# mismos buffers). Cada modo corre en un proceso nuevo.
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import common  # noqa: F401  (agrega la raíz del repositorio a sys.path)
+
+import ingest
+import storage
+from testkit import synthetic_sales
+
+SESSION_SNIPPET = """
+import json, pickle, sys, time
+sys.path.insert(0, {root!r})
+sys.path.insert(0, {bench!r})
+from common import peak_rss_mb
+import dataset, ingest
+base = ingest.load_dataset({path!r})
+cached = pickle.dumps(base) if {mode!r} == 'copy' else dataset.freeze(base)
+after_load = peak_rss_mb()
+sessions, latencies = [], []
+for _ in range({sessions}):
+    t0 = time.perf_counter()
+    df = pickle.loads(cached) if {mode!r} == 'copy' else cached.copy(deep=False)
+    latencies.append(time.perf_counter() - t0)
+    sessions.append(df)
+print(json.dumps({{'after_load_mb': after_load, 'peak_rss_mb': peak_rss_mb(),
+                  'rerun_ms': 1000 * sum(latencies) / len(latencies)}}))
+"""
+
+
+def run_mode(path: str, mode: str, sessions: int) -> dict:
+    bench = os.path.dirname(os.path.abspath(__file__))
+    code = SESSION_SNIPPET.format(root=os.path.dirname(bench), bench=bench, path=path, mode=mode, sessions=sessions)
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True)
+    return json.loads(out.stdout)
+
+
+def main(n_rows: int, sessions: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "data_aug.feather")
+        storage.write_dataset(ingest.enrich(synthetic_sales(n_rows)), path)
+        results = {mode: run_mode(path, mode, sessions) for mode in ("copy", "shared")}
+    print(f"{'modo':<8}{'RSS tras carga (MB)':>22}{'RSS con ' + str(sessions) + ' sesiones (MB)':>30}{'rerun (ms)':>12}")
+    for mode, r in results.items():
+        print(f"{mode:<8}{r['after_load_mb']:>22.0f}{r['peak_rss_mb']:>30.0f}{r['rerun_ms']:>12.2f}")
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 20)
@@ -0,0 +1,79 @@
+# bench_sketches.py  (precisión y costo del modo aproximado de KPIs)
+#
+# Uso: python benchmarks/bench_sketches.py [filas] [productos]
+# Para varias precisiones del HyperLogLog responde filtros aleatorios (rango de fechas y
+# categoría) con sketches.DistinctSketches y con el cubo exacto. Falla si algún KPI
+# aditivo difiere o si el error de 'Unique products' supera 4 errores típicos; reporta
+# el error medio, el p95, la proporción dentro de 2 errores típicos y los tiempos.
+
+import sys
+import time
+
+import numpy as np
+
+import common  # noqa: F401  (agrega la raíz del repositorio a sys.path)
+
+import aggregations
+import ingest
+import rollup
+import sketches
+import storage
+from testkit import synthetic_sales
+
+PRECISIONS = [10, 12, 14]
+FILTERS = 200
+
+
+def random_filters(days: np.ndarray, categories: list, n: int, seed: int = 0) -> list:
+    """Rangos de fechas de 1 día al total y, en la mitad de los casos, una categoría"""
+    rng = np.random.default_rng(seed)
+    out = []
+    for _ in range(n):
+        start, end = np.sort(rng.integers(0, len(days), 2))
+        cat = categories[rng.integers(len(categories))] if rng.random() < 0.5 else "All"
+        out.append((days[start], days[end], cat))
+    return out
+
+
+def main(n_rows: int, n_products: int) -> None:
+    df = storage.compact(ingest.enrich(synthetic_sales(n_rows, n_products=n_products)))
+    cube = rollup.build_cube(df)
+    days = np.sort(df["fecha_venta_dt"].dt.normalize().unique())
+    filters = random_filters(days, sorted(df["categoria"].unique()), FILTERS)
+
+    t0 = time.perf_counter()
+    exact = [aggregations.panels_from_partials(rollup.slice_cube(cube, *f), names=["kpis"])["kpis"] for f in filters]
+    exact_ms = (time.perf_counter() - t0) * 1000 / len(filters)
+    print(f"{n_rows:,} filas, {n_products:,} productos, cubo de {len(cube):,} filas; "
+          f"{len(filters)} filtros, exacto {exact_ms:.2f} ms por filtro")
+
+    print(f"{'precisión':>9}{'error típico':>14}{'error medio':>13}{'p95':>8}{'en 2σ':>8}"
+          f"{'ms/filtro':>11}{'sketches':>10}")
+    for precision in PRECISIONS:
+        sigma = sketches.standard_error(precision)
+        t0 = time.perf_counter()
+        sketch = sketches.DistinctSketches(cube, precision)
+        build_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        approx = [sketch.kpis(*f) for f in filters]
+        approx_ms = (time.perf_counter() - t0) * 1000 / len(filters)
+
+        errors = []
+        for f, a, e in zip(filters, approx, exact):
+            for key in ("Total revenue", "Units sold", "Avg ticket"):
+                assert np.isclose(a[key], e[key], rtol=1e-9, equal_nan=True), (f, key)
+            if e["Unique products"]:
+                errors.append(a["Unique products"] / e["Unique products"] - 1)
+            else:
+                assert a["Unique products"] == 0, f
+        errors = np.abs(errors)
+        assert errors.max() <= 4 * sigma, f"precisión {precision}: error máximo {errors.max():.2%}"
+        print(f"{precision:>9}{sigma:>14.2%}{errors.mean():>13.2%}{np.percentile(errors, 95):>8.2%}"
+              f"{np.mean(errors <= 2 * sigma):>8.0%}{approx_ms:>11.2f}"
+              f"{sketch.registers.nbytes / 2**20:>7.1f} MB  (armado {build_s:.2f} s)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 50_000)
@@ -0,0 +1,51 @@
+# bench_slicing.py  (máscara booleana + copia vs búsqueda binaria sobre el índice de fechas)
+#
+# Uso: python benchmarks/bench_slicing.py [filas]
+
+import sys
+import time
+
+import pandas as pd
+
+import common  # noqa: F401  (agrega la raíz del repositorio a sys.path)
+
+import aggregations
+import dataset
+import ingest
+import storage
+from testkit import synthetic_sales
+
+SELECTIVITIES = [0.01, 0.10, 0.50, 1.00]
+
+
+def best_of(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(n_rows: int) -> None:
+    df = dataset.freeze(storage.compact(ingest.enrich(synthetic_sales(n_rows))))
+    t0 = time.perf_counter()
+    index = dataset.DateIndex(df)
+    print(f"índice construido en {time.perf_counter() - t0:.2f} s para {n_rows:,} filas")
+
+    days = df["fecha_venta_dt"].sort_values().unique()
+    category = df["categoria"].cat.categories[0]
+    print(f"{'selectividad':>12}{'categoría':>14}{'máscara (ms)':>14}{'índice (ms)':>13}{'speedup':>9}")
+    for fraction in SELECTIVITIES:
+        start, end = days[0], days[max(0, int(len(days) * fraction) - 1)]
+        for cat in ("All", category):
+            expected = aggregations.filter_rows(df, start, end, cat)
+            actual = index.slice(df, start, end, cat)
+            pd.testing.assert_frame_equal(expected, actual)
+            mask_s = best_of(lambda: aggregations.filter_rows(df, start, end, cat))
+            index_s = best_of(lambda: index.slice(df, start, end, cat))
+            print(f"{fraction:>12.0%}{cat:>14}{mask_s * 1000:>14.1f}{index_s * 1000:>13.2f}{mask_s / index_s:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,67 @@
+# bench_storage.py  (carga en frío: CSV vs Parquet vs Feather)
+#
+# Uso: python benchmarks/bench_storage.py [filas]
+# Cada carga corre en un proceso nuevo para medir tiempo y pico de RSS en frío. Falla
+# si algún formato no carga todas las filas o da otros agregados (por mes y totales).
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import common  # noqa: F401  (agrega la raíz del repositorio a sys.path)
+
+import ingest
+import storage
+from testkit import synthetic_sales
+
+LOAD_SNIPPET = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+sys.path.insert(0, {bench!r})
+from common import peak_rss_mb
+base = peak_rss_mb()
+import ingest
+t0 = time.perf_counter()
+df = ingest.load_dataset({path!r})
+seconds = time.perf_counter() - t0
+month = df['fecha_venta_dt'].dt.strftime('%Y-%m')
+checks = {{'rows': len(df), 'revenue': round(float(df['revenue'].sum()), 2),
+          'units_by_month': {{m: int(u) for m, u in df.groupby(month)['unidades_vendidas'].sum().items()}}}}
+print(json.dumps({{'seconds': seconds, 'peak_rss_mb': peak_rss_mb(), 'import_rss_mb': base, 'checks': checks}}))
+"""
+
+
+def cold_load(path: str) -> dict:
+    """Carga `path` en un subproceso y devuelve sus métricas"""
+    bench = os.path.dirname(os.path.abspath(__file__))
+    code = LOAD_SNIPPET.format(root=os.path.dirname(bench), bench=bench, path=path)
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True)
+    return json.loads(out.stdout)
+
+
+def main(n_rows: int) -> None:
+    df = synthetic_sales(n_rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for ext in (".csv", ".parquet", ".feather"):
+            path = os.path.join(tmp, "data_aug" + ext)
+            t0 = time.perf_counter()
+            storage.write_dataset(df if ext == ".csv" else ingest.enrich(df), path)
+            write_s = time.perf_counter() - t0
+            results[ext[1:]] = {"write_seconds": write_s, "size_mb": os.path.getsize(path) / 2**20, **cold_load(path)}
+    # La comparación de tiempos solo vale si todos los formatos cargan el mismo dataset
+    expected = results["parquet"]["checks"]
+    assert expected["rows"] == n_rows, expected["rows"]
+    for fmt, r in results.items():
+        assert r["checks"] == expected, f"{fmt} carga otro dataset: {r['checks']} != {expected}"
+    print(f"{'formato':<10}{'carga (s)':>12}{'pico RSS (MB)':>16}{'archivo (MB)':>14}")
+    for fmt, r in results.items():
+        print(f"{fmt:<10}{r['seconds']:>12.2f}{r['peak_rss_mb']:>16.0f}{r['size_mb']:>14.1f}")
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
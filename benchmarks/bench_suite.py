@@ -0,0 +1,217 @@
+# bench_suite.py  (suite reproducible: carga, filtro y agregados por panel a varias escalas)
+#
+# Uso: python benchmarks/bench_suite.py [--rows 100000 1000000 10000000] [--repeat 3]
+#                                       [--output resultados.json] [--compare base.json]
+#
+# Ejecuta el pipeline del dashboard sin Streamlit sobre datasets sintéticos y mide, por
+# caso, el mejor tiempo de `--repeat` ejecuciones y el pico de memoria de una ejecución
+# más con tracemalloc (buffers de numpy/pandas; no incluye los de Arrow al leer Parquet,
+# que se ven en el pico de RSS de cada escala). Casos:
+#
+#   load                        lectura + enriquecimiento + compactación (load_data)
+#   load.cube / load.index      cubo diario y índice de fechas que se arman al cargar
+#   filter.mask / filter.index  filtro del sidebar: máscara booleana vs búsqueda binaria
+#   panel.<nombre>              cada panel con un groupby sobre las filas filtradas
+#                               (product_metrics incluye las medianas de los cuadrantes)
+#   panels.fused / .rollup      todos los paneles en una pasada / desde el cubo diario,
+#                               también con las medianas
+#
+# Los resultados se guardan como JSON (por defecto benchmarks/results/<commit>.json) y
+# `--compare` los contrasta con los de otro commit: sale con código 1 si algún caso es
+# más lento o usa más memoria que el umbral.
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from common import peak_rss_mb
+
+import aggregations
+import dataset
+import ingest
+import rollup
+import storage
+from testkit import synthetic_sales
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCALES = [100_000, 1_000_000, 10_000_000]
+
+
+def with_medians(metrics: pd.DataFrame) -> tuple:
+    """Tabla de margen vs rotación y las medianas de sus cuadrantes, como la dibuja charts.py"""
+    return metrics, metrics["tasa_rotacion"].median(), metrics["margen_porcentual"].median()
+
+
+def with_quadrants(panels: dict) -> dict:
+    """Todos los paneles más las medianas de los cuadrantes"""
+    return {**panels, "quadrants": with_medians(panels["product_metrics"])[1:]}
+
+
+# Paneles del dashboard calculados con un groupby cada uno (versión de referencia)
+PANELS = {
+    "kpis": aggregations.kpis,
+    "top_products": aggregations.top_products_by_units,
+    "product_metrics": lambda filtered: with_medians(aggregations.product_metrics(filtered)),
+    "satisfaction": aggregations.satisfaction_by_category,
+    "satisfaction_dist": aggregations.satisfaction_dist,
+    "prices": aggregations.price_comparison,
+}
+
+# Casos con menos de esto en la base no se comparan: el ruido supera la diferencia
+MIN_COMPARE_MS = 1.0
+
+
+def measure(fn, repeat: int) -> dict:
+    """Mejor y promedio de `repeat` ejecuciones, y pico de memoria de una más"""
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"best_ms": round(min(times), 3), "mean_ms": round(sum(times) / len(times), 3),
+            "peak_mb": round(peak / 2**20, 2)}
+
+
+def filters(df: pd.DataFrame) -> dict:
+    """Filtro por defecto del sidebar (todo el rango, todas las categorías) y uno acotado"""
+    days = df["fecha_venta_dt"].dt.normalize().unique()
+    return {
+        "default": (days.min(), days.max(), "All"),
+        "month": (days.max() - pd.Timedelta(days=30), days.max(), df["categoria"].cat.categories[0]),
+    }
+
+
+def run_scale(n_rows: int, repeat: int, seed: int) -> list:
+    """Todos los casos sobre un dataset sintético de `n_rows` filas"""
+    results = []
+
+    def record(case: str, fn, **fields) -> None:
+        result = {"rows": n_rows, "case": case, **fields, **measure(fn, repeat)}
+        results.append(result)
+        print(f"{n_rows:>12,} {case:<28} {result['best_ms']:>11,.1f} ms {result['peak_mb']:>10,.1f} MB",
+              flush=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "data_aug.parquet")
+        storage.write_dataset(ingest.enrich(synthetic_sales(n_rows, seed=seed)), path)
+        record("load", lambda: dataset.freeze(ingest.load_dataset(path)))
+        df = dataset.freeze(ingest.load_dataset(path))
+
+    record("load.cube", lambda: rollup.build_cube(df))
+    record("load.index", lambda: dataset.DateIndex(df))
+    cube, index = rollup.build_cube(df), dataset.DateIndex(df)
+
+    for name, (start, end, cat) in filters(df).items():
+        record(f"filter.mask[{name}]", lambda: aggregations.filter_rows(df, start, end, cat))
+        record(f"filter.index[{name}]", lambda: index.slice(df, start, end, cat))
+
+    # Los paneles se miden sobre el filtro por defecto: todas las filas, el peor caso
+    start, end, cat = filters(df)["default"]
+    filtered = index.slice(df, start, end, cat)
+    for name, compute in PANELS.items():
+        record(f"panel.{name}", lambda: compute(filtered))
+    record("panels.fused", lambda: with_quadrants(aggregations.compute_panels(filtered)))
+    record("panels.rollup", lambda: with_quadrants(rollup.compute_panels(cube, start, end, cat)))
+
+    for result in results:
+        result["df_mb"] = round(df.memory_usage(deep=True).sum() / 2**20, 2)
+    return results
+
+
+def git_commit() -> tuple:
+    """(commit corto, si hay cambios sin commitear) o (None, None) fuera de un repositorio"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout
+        return commit, bool(status.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def environment(repeat: int, seed: int) -> dict:
+    commit, dirty = git_commit()
+    return {
+        "commit": commit,
+        "dirty": dirty,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "repeat": repeat,
+        "seed": seed,
+    }
+
+
+def compare(base: dict, current: dict, threshold: float) -> list:
+    """Imprime la razón actual/base por caso y devuelve los que superan `threshold`"""
+    previous = {(r["rows"], r["case"]): r for r in base["results"]}
+    print(f"\ncomparación contra {base['environment'].get('commit')} (umbral {threshold:.2f}x)")
+    regressions = []
+    for result in current["results"]:
+        old = previous.get((result["rows"], result["case"]))
+        if old is None or old["best_ms"] < MIN_COMPARE_MS:
+            continue
+        time_ratio = result["best_ms"] / old["best_ms"]
+        memory_ratio = result["peak_mb"] / old["peak_mb"] if old["peak_mb"] else 1.0
+        flag = ""
+        if time_ratio > threshold or memory_ratio > threshold:
+            regressions.append(result)
+            flag = "  <- regresión"
+        print(f"{result['rows']:>12,} {result['case']:<28} tiempo {time_ratio:5.2f}x  memoria {memory_ratio:5.2f}x{flag}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks de carga, filtro y agregados del dashboard")
+    parser.add_argument("--rows", type=int, nargs="+", default=SCALES, help="Tamaños de dataset a medir")
+    parser.add_argument("--repeat", type=int, default=3, help="Ejecuciones cronometradas por caso")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla de los datos sintéticos")
+    parser.add_argument("--output", help="Archivo JSON de resultados (por defecto benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="JSON de otra ejecución para detectar regresiones")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="Razón actual/base a partir de la cual un caso es una regresión")
+    args = parser.parse_args()
+
+    report = {"environment": environment(args.repeat, args.seed), "results": [], "peak_rss_mb": {}}
+    print(f"{'filas':>12} {'caso':<28} {'mejor tiempo':>14} {'pico de memoria':>13}")
+    # De menor a mayor: el pico de RSS del proceso tras cada escala es el de esa escala
+    for n_rows in sorted(args.rows):
+        report["results"] += run_scale(n_rows, args.repeat, args.seed)
+        report["peak_rss_mb"][str(n_rows)] = round(peak_rss_mb(), 1)
+
+    output = args.output or os.path.join(
+        ROOT, "benchmarks", "results", f"{report['environment']['commit'] or 'local'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"\nresultados en {output}")
+
+    if args.compare:
+        with open(args.compare) as fh:
+            regressions = compare(json.load(fh), report, args.threshold)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
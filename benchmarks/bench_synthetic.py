@@ -0,0 +1,100 @@
+# bench_synthetic.py  (motor de columnas sintéticas de data_convert.py)
+#
+# Uso: python benchmarks/bench_synthetic.py [filas]
+# Compara el motor por lotes (una llamada al generador por distribución, disponibilidad
+# como códigos) con el esquema anterior (una llamada por columna y por copia, con
+# textos) y verifica que la generación es determinista: misma semilla, mismo
+# dataset, sin importar si se genera completo o por chunks.
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import common  # noqa: F401  (agrega la raíz del repositorio a sys.path)
+
+import data_convert
+import storage
+from testkit import synthetic_sales
+
+MONTHS = 5
+
+
+def legacy_draws(rng: np.random.Generator, n: int, months: int = MONTHS) -> list:
+    """Llamadas del generador anterior: una por columna, repetidas para cada copia"""
+    options = data_convert.AVAILABILITY_OPTIONS
+    draws = [
+        rng.choice([1, 2, 3, 4, 5], size=n, p=data_convert.SATISFACTION_WEIGHTS),
+        rng.uniform(0.05, 0.15, n),
+        rng.uniform(-0.10, 0.20, n),
+    ]
+    draws += [rng.choice(options, size=n, p=w) for w in data_convert.AVAILABILITY_WEIGHTS]
+    draws += [rng.normal(mean, std, n).clip(1, 5) for mean, std in data_convert.RATINGS]
+    for _ in range(months):
+        draws += [rng.integers(0, 28, size=n), rng.uniform(0.95, 1.05, n),
+                  rng.choice([1, 2, 3, 4, 5], size=n, p=data_convert.SATISFACTION_WEIGHTS)]
+    return draws
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def check_determinism(n_rows: int) -> None:
+    a = data_convert.draw_synthetic(data_convert.block_rng(42, 0), n_rows)
+    b = data_convert.draw_synthetic(data_convert.block_rng(42, 0), n_rows)
+    c = data_convert.draw_synthetic(data_convert.block_rng(43, 0), n_rows)
+    assert all(np.array_equal(a[k], b[k]) for k in a), "misma semilla, distintos valores"
+    assert not np.array_equal(a["satisfaccion"], c["satisfaccion"]), "semillas distintas, mismos valores"
+
+    # Distribuciones: frecuencias dentro de 1 punto de las probabilidades configuradas
+    freq = np.bincount(a["satisfaccion"].ravel(), minlength=6)[1:] / a["satisfaccion"].size
+    assert np.allclose(freq, data_convert.SATISFACTION_WEIGHTS, atol=0.01), freq
+    for codes, weights in zip(a["disponibilidad"], data_convert.AVAILABILITY_WEIGHTS):
+        assert np.allclose(np.bincount(codes, minlength=4) / len(codes), weights, atol=0.01)
+
+    # Dataset completo: repetible, y el camino por chunks escribe exactamente lo mismo
+    raw = synthetic_sales(2 * data_convert.BLOCK_ROWS + 1000)[
+        ["fecha_venta", "producto", "categoria", "precio", "unidades_vendidas", "fuente_trafico"]]
+    raw["fecha_venta"] = raw["fecha_venta"].dt.strftime("%d/%m/%Y")
+    with tempfile.TemporaryDirectory() as tmp:
+        # Ambos caminos leen el mismo CSV (read_csv no devuelve los float bit a bit)
+        source = os.path.join(tmp, "data.csv")
+        raw.to_csv(source, index=False, **storage.CSV_OPTIONS)
+        batch = data_convert.generate(pd.read_csv(source, **storage.CSV_OPTIONS), seed=42)
+        again = data_convert.generate(pd.read_csv(source, **storage.CSV_OPTIONS), seed=42)
+        pd.testing.assert_frame_equal(batch, again)
+        batch_csv = os.path.join(tmp, "batch.csv")
+        batch.to_csv(batch_csv, sep="\t", index=False, encoding="latin1")
+        chunked_csv = os.path.join(tmp, "chunked.csv")
+        data_convert.generate_streaming(source, 42, data_convert.BLOCK_ROWS, csv_path=chunked_csv,
+                                        parquet_path=os.path.join(tmp, "chunked.parquet"))
+        with open(batch_csv, "rb") as fa, open(chunked_csv, "rb") as fb:
+            assert fa.read() == fb.read(), "el camino por chunks difiere del completo"
+    print(f"✅ determinista: misma semilla, mismos valores; {len(batch):,} filas iguales completo y por chunks")
+
+
+def main(n_rows: int) -> None:
+    legacy = best_of(lambda: legacy_draws(np.random.default_rng(0), n_rows))
+    batched = best_of(lambda: data_convert.draw_synthetic(np.random.default_rng(0), n_rows, MONTHS))
+    print(f"{n_rows:,} filas x {MONTHS + 1} copias: por columna {legacy * 1000:.0f} ms, "
+          f"por lotes {batched * 1000:.0f} ms (x{legacy / batched:.1f})")
+
+    old = legacy_draws(np.random.default_rng(0), n_rows)[3:6]
+    new = data_convert.draw_synthetic(np.random.default_rng(0), n_rows, MONTHS)["disponibilidad"]
+    print(f"disponibilidad: textos {sum(a.nbytes for a in old) / 2**20:.1f} MB, "
+          f"códigos {new.nbytes / 2**20:.1f} MB")
+
+    check_determinism(min(n_rows, 1_000_000))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,21 @@
+# common.py  (utilidades compartidas por los benchmarks)
+
+import os
+import resource
+import sys
+
+# Permite importar los módulos del dashboard (y testkit) al ejecutar desde benchmarks/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def peak_rss_mb() -> float:
+    """Pico de memoria residente del proceso actual en MB"""
+    # VmHWM se reinicia con exec(); ru_maxrss puede heredar el pico del padre
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
@@ -0,0 +1,61 @@
+# cache.py  (caché LRU con expiración y contadores, compartida entre sesiones)
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Caché LRU acotada por cantidad de entradas y, opcionalmente, por antigüedad (TTL).
+
+    Es segura entre hilos: Streamlit atiende cada sesión en su propio hilo. El cálculo
+    de un valor faltante se hace fuera del candado para no bloquear otras sesiones.
+    """
+
+    def __init__(self, max_entries: int = 64, ttl: float | None = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        """Devuelve el valor de `key`, calculándolo con `compute()` si no está o expiró"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (self.ttl is None or now - entry[0] < self.ttl):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        value = compute()
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Contadores para dimensionar la caché"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,354 @@
+# charts.py  (figuras y tablas de cada panel del dashboard, a partir de sus agregados)
+
+from __future__ import annotations
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+# Hasta cuántos productos se dibuja un marcador SVG por producto
+SCATTER_SVG_LIMIT = 5_000
+# Hasta cuántos productos se usa WebGL (scattergl); por encima, grilla de densidad
+SCATTER_WEBGL_LIMIT = 50_000
+# Productos con más revenue que se mantienen como puntos en la grilla de densidad
+SCATTER_TOP_OUTLIERS = 200
+# Celdas por eje de la grilla de densidad
+SCATTER_BINS = 80
+# Tamaño máximo del JSON de la figura que se envía al navegador
+SCATTER_MAX_PAYLOAD = 2 * 2**20
+
+# Tablas: columnas a mostrar, nombres visibles y formato de cada columna
+TABLES = {
+    'top_products': {
+        'columns': {
+            'producto': 'Producto',
+            'unidades_vendidas': 'Unidades Vendidas',
+            'revenue': 'Revenue Total',
+            'precio': 'Precio Promedio',
+            'categoria': 'Categoría'
+        },
+        'format': {
+            'Unidades Vendidas': '{:,.0f}',
+            'Revenue Total': '${:,.0f}',
+            'Precio Promedio': '${:,.0f}'
+        },
+    },
+    'top_margin': {
+        'columns': {
+            'producto': 'Producto',
+            'margen_porcentual': 'Margen (%)',
+            'tasa_rotacion': 'Rotación',
+            'revenue': 'Revenue',
+            'categoria': 'Categoría'
+        },
+        'format': {
+            'Margen (%)': '{:.1f}%',
+            'Rotación': '{:,.0f}',
+            'Revenue': '${:,.0f}'
+        },
+    },
+    'top_rotation': {
+        'columns': {
+            'producto': 'Producto',
+            'tasa_rotacion': 'Rotación',
+            'margen_porcentual': 'Margen (%)',
+            'revenue': 'Revenue',
+            'categoria': 'Categoría'
+        },
+        'format': {
+            'Rotación': '{:,.0f}',
+            'Margen (%)': '{:.1f}%',
+            'Revenue': '${:,.0f}'
+        },
+    },
+    'satisfaction': {
+        'columns': {
+            'categoria': 'Categoría',
+            'satisfaccion_promedio': 'Satisfacción',
+            'total_ventas': 'Total Ventas',
+            'revenue_total': 'Revenue Total'
+        },
+        'format': {
+            'Satisfacción': '{:.2f}',
+            'Total Ventas': '{:,.0f}',
+            'Revenue Total': '${:,.0f}'
+        },
+    },
+    'prices': {
+        'columns': {
+            'categoria': 'Categoría',
+            'precio_homecenter': 'HomeCenter',
+            'precio_amazon': 'Amazon',
+            'precio_mercadolibre': 'MercadoLibre',
+            'diff_amazon_hc': 'Diff Amazon',
+            'diff_ml_hc': 'Diff ML'
+        },
+        'format': {
+            'HomeCenter': '${:,.0f}',
+            'Amazon': '${:,.0f}',
+            'MercadoLibre': '${:,.0f}',
+            'Diff Amazon': '{:+.1f}%',
+            'Diff ML': '{:+.1f}%'
+        },
+    },
+}
+
+MARGIN_ROTATION_LABELS = {
+    'margen_porcentual': 'Margen de Ganancia (%)',
+    'tasa_rotacion': 'Tasa de Rotación (Unidades Vendidas)',
+    'revenue': 'Revenue Total'
+}
+
+
+def _points(metrics: pd.DataFrame, render_mode: str) -> go.Figure:
+    """Un marcador por producto, tamaño según revenue y color por categoría"""
+    return px.scatter(
+        metrics,
+        x='margen_porcentual',
+        y='tasa_rotacion',
+        size='revenue',
+        color='categoria',
+        hover_name='producto',
+        title='Margen de Ganancia vs Tasa de Rotación',
+        labels=MARGIN_ROTATION_LABELS,
+        hover_data=['precio', 'revenue'],
+        render_mode=render_mode
+    )
+
+
+def _edges(values: np.ndarray, bins: int) -> np.ndarray:
+    """Bordes de `bins` celdas que cubren `values` (con ancho mínimo si todos son iguales)"""
+    lo, hi = float(values.min()), float(values.max())
+    if lo == hi:
+        lo, hi = lo - 0.5, hi + 0.5
+    return np.linspace(lo, hi, bins + 1)
+
+
+def _density(metrics: pd.DataFrame, bins: int, top_n: int) -> go.Figure:
+    """Grilla de densidad calculada en el servidor más los `top_n` productos por revenue"""
+    x = metrics['margen_porcentual'].to_numpy(dtype='float64')
+    y = metrics['tasa_rotacion'].to_numpy(dtype='float64')
+    x_edges, y_edges = _edges(x, bins), _edges(y, bins)
+    counts, _, _ = np.histogram2d(x, y, bins=[x_edges, y_edges])
+    revenue, _, _ = np.histogram2d(x, y, bins=[x_edges, y_edges],
+                                   weights=metrics['revenue'].to_numpy(dtype='float64'))
+
+    # Celdas vacías como nulos para que queden transparentes
+    z = np.where(counts.T > 0, counts.T, np.nan)
+    fig = go.Figure(go.Heatmap(
+        x=(x_edges[:-1] + x_edges[1:]) / 2,
+        y=(y_edges[:-1] + y_edges[1:]) / 2,
+        z=z,
+        customdata=revenue.T.round(0),
+        colorscale='Blues',
+        colorbar=dict(title='Productos'),
+        hovertemplate=('Margen: %{x:.1f}%<br>Rotación: %{y:,.0f}<br>Productos: %{z:,.0f}'
+                       '<br>Revenue: $%{customdata:,.0f}<extra></extra>'),
+    ))
+    outliers = _points(metrics.nlargest(top_n, 'revenue'), 'webgl')
+    fig.add_traces(outliers.data)
+    fig.update_layout(title='Margen de Ganancia vs Tasa de Rotación '
+                            f'(densidad de {len(metrics):,} productos, top {top_n} por revenue como puntos)')
+    return fig
+
+
+def _payload(fig: go.Figure) -> int:
+    """Bytes del JSON que recibe el navegador"""
+    return len(fig.to_json())
+
+
+def _decorate(fig: go.Figure, metrics: pd.DataFrame) -> go.Figure:
+    """Diseño común y líneas de referencia de los cuadrantes (sobre todos los productos)"""
+    fig.update_layout(
+        height=600,
+        margin=dict(l=0, r=0, t=40, b=0),
+        xaxis_title=MARGIN_ROTATION_LABELS['margen_porcentual'],
+        yaxis_title=MARGIN_ROTATION_LABELS['tasa_rotacion'],
+        showlegend=True
+    )
+    fig.add_hline(
+        y=metrics['tasa_rotacion'].median(),
+        line_dash="dash",
+        line_color="gray",
+        annotation_text="Mediana Rotación"
+    )
+    fig.add_vline(
+        x=metrics['margen_porcentual'].median(),
+        line_dash="dash",
+        line_color="gray",
+        annotation_text="Mediana Margen"
+    )
+    return fig
+
+
+def margin_rotation_figure(metrics: pd.DataFrame,
+                           svg_limit: int = SCATTER_SVG_LIMIT,
+                           webgl_limit: int = SCATTER_WEBGL_LIMIT,
+                           top_n: int = SCATTER_TOP_OUTLIERS,
+                           bins: int = SCATTER_BINS,
+                           max_payload: int = SCATTER_MAX_PAYLOAD) -> tuple[go.Figure, dict]:
+    """Dispersión margen vs rotación con un modo de dibujo acorde al número de productos.
+
+    SVG para catálogos chicos, WebGL hasta `webgl_limit` productos y, por encima (o si
+    el JSON supera `max_payload`), una grilla de densidad con los `top_n` productos de
+    mayor revenue como puntos. Devuelve la figura y {'mode', 'products', 'points',
+    'payload_bytes'} para informar en el dashboard.
+    """
+    n = len(metrics)
+    if n <= webgl_limit:
+        mode = 'svg' if n <= svg_limit else 'webgl'
+        fig = _decorate(_points(metrics, mode), metrics)
+        payload = _payload(fig)
+        if payload <= max_payload:
+            return fig, {'mode': mode, 'products': n, 'points': n, 'payload_bytes': payload}
+
+    # Grilla de densidad: se achica hasta que el JSON entre en el límite
+    top_n = min(top_n, n)
+    while True:
+        fig = _decorate(_density(metrics, bins, top_n), metrics)
+        payload = _payload(fig)
+        if payload <= max_payload or bins <= 10:
+            break
+        bins, top_n = bins // 2, top_n // 2
+    return fig, {'mode': 'density', 'products': n, 'points': top_n, 'payload_bytes': payload}
+
+
+# ---------- Resto de los paneles ----------
+
+def products_figure(top_products: pd.DataFrame, top_n: int = 15) -> go.Figure:
+    """Barras horizontales de los `top_n` productos más vendidos por unidades"""
+    fig = px.bar(
+        top_products,
+        x='unidades_vendidas',
+        y='producto',
+        orientation='h',
+        color='categoria',
+        title=f'Top {top_n} Productos Más Vendidos por Unidades',
+        labels={'unidades_vendidas': 'Unidades Vendidas', 'producto': 'Producto'},
+        hover_data=['revenue', 'precio']
+    )
+    fig.update_layout(
+        height=600,
+        margin=dict(l=0, r=0, t=40, b=0),
+        xaxis_title='Unidades Vendidas',
+        yaxis_title='Producto',
+        showlegend=True
+    )
+    # Mejorar la presentación del gráfico
+    fig.update_traces(
+        texttemplate='%{x:,}',
+        textposition='outside'
+    )
+    return fig
+
+
+def satisfaction_figure(satisfaction: pd.DataFrame) -> go.Figure:
+    """Satisfacción promedio por categoría"""
+    fig = px.bar(
+        satisfaction,
+        x='categoria',
+        y='satisfaccion_promedio',
+        color='satisfaccion_promedio',
+        title='Satisfacción Promedio por Categoría de Producto',
+        labels={'satisfaccion_promedio': 'Satisfacción Promedio (1-5)', 'categoria': 'Categoría'},
+        color_continuous_scale='RdYlGn'
+    )
+    fig.update_layout(
+        height=500,
+        margin=dict(l=0, r=0, t=40, b=0),
+        xaxis_title='Categoría',
+        yaxis_title='Satisfacción Promedio',
+        showlegend=False
+    )
+    # Agregar valores en las barras
+    fig.update_traces(
+        texttemplate='%{y:.2f}',
+        textposition='outside'
+    )
+    return fig
+
+
+def satisfaction_dist_figure(dist: pd.Series) -> go.Figure:
+    """Torta con la cantidad de ventas por puntaje de satisfacción"""
+    fig = px.pie(
+        values=dist.values,
+        names=[f'{i} Estrellas' for i in dist.index],
+        title='Distribución de Puntajes de Satisfacción'
+    )
+    fig.update_layout(margin=dict(l=0, r=0, t=40, b=0))
+    return fig
+
+
+def price_comparison_figure(prices: pd.DataFrame) -> go.Figure:
+    """Precio promedio por canal y categoría"""
+    fig = px.bar(
+        prices,
+        x='categoria',
+        y=['precio_homecenter', 'precio_amazon', 'precio_mercadolibre'],
+        title='Comparación de Precios Promedio por Canal',
+        labels={'value': 'Precio Promedio ($)', 'variable': 'Canal', 'categoria': 'Categoría'},
+        barmode='group'
+    )
+    fig.update_layout(
+        height=600,
+        margin=dict(l=0, r=0, t=40, b=0),
+        xaxis_title='Categoría',
+        yaxis_title='Precio Promedio ($)',
+        showlegend=True
+    )
+    return fig
+
+
+def price_diff_figure(prices: pd.DataFrame) -> go.Figure:
+    """Diferencias porcentuales de Amazon y MercadoLibre contra HomeCenter"""
+    fig = px.bar(
+        prices,
+        x='categoria',
+        y=['diff_amazon_hc', 'diff_ml_hc'],
+        title='Diferencias de Precio vs HomeCenter (%)',
+        labels={'value': 'Diferencia (%)', 'variable': 'Canal', 'categoria': 'Categoría'},
+        barmode='group'
+    )
+    fig.update_layout(
+        height=400,
+        margin=dict(l=0, r=0, t=40, b=0),
+        xaxis_title='Categoría',
+        yaxis_title='Diferencia (%)',
+        showlegend=True
+    )
+    # Agregar línea de referencia en 0%
+    fig.add_hline(y=0, line_dash="dash", line_color="red", annotation_text="Precio HomeCenter")
+    return fig
+
+
+# ---------- Tablas ----------
+
+def _printf(fmt: str) -> str:
+    """'${:,.0f}' -> '$%,.0f': formato de str.format al printf de column_config"""
+    return fmt.replace('%', '%%').replace('{:', '%').replace('}', '')
+
+
+def table(name: str, frame: pd.DataFrame, mode: str = 'column_config') -> tuple:
+    """Tabla `name` de TABLES para st.dataframe: (datos, formato printf por columna).
+
+    'column_config' deja los valores numéricos y el navegador aplica el formato (no se
+    recorren celdas en el servidor); 'styler' devuelve un pandas Styler ya formateado.
+    """
+    spec = TABLES[name]
+    data = frame[list(spec['columns'])].rename(columns=spec['columns'])
+    if mode == 'styler':
+        return data.style.format(spec['format']), {}
+    return data, {col: _printf(fmt) for col, fmt in spec['format'].items()}
+
+
+# ---------- Caché de figuras y tablas ----------
+
+def digest(data: pd.DataFrame | pd.Series) -> str:
+    """Hash del contenido de un agregado: mismo agregado, misma figura o tabla"""
+    frame = data.to_frame() if isinstance(data, pd.Series) else data
+    h = hashlib.sha1(repr(list(zip(frame.columns, frame.dtypes.astype(str)))).encode())
+    h.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+    return h.hexdigest()
@@ -1,111 +1,366 @@
 # augment_sales.py  (versión mejorada con satisfacción y precios por canal)
+#
+# Uso:
+#   python data_convert.py                          genera data_aug.csv y data_aug.parquet
+#   python data_convert.py --partitioned            genera el dataset particionado data_aug/
+#   python data_convert.py --append nuevas.csv      agrega ventas nuevas a data_aug/
+#   python data_convert.py --chunksize 500000       igual que el primero, con memoria acotada
+#   python data_convert.py --rows 10000000          data_aug/ con 10M filas, en paralelo
+# Con --seed el resultado es reproducible y no depende de --chunksize ni de --workers.
+
+import argparse
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+import ingest
+import partitions
+import storage
+
+# Filas de entrada por bloque de generación; cada bloque tiene su propio flujo aleatorio
+BLOCK_ROWS = 65_536
+
+# Distribuciones de las columnas sintéticas
+# Satisfacción: 70% satisfechos (4-5), 20% neutral (3), 10% insatisfechos (1-2)
+SATISFACTION_WEIGHTS = [0.05, 0.05, 0.20, 0.40, 0.30]  # Probabilidades para puntajes 1-5
+CHANNELS = ["homecenter", "amazon", "mercadolibre"]
+AVAILABILITY_OPTIONS = ["Disponible", "Consultar", "Agotado", "Envío 24h"]
+AVAILABILITY_WEIGHTS = [
+    [0.60, 0.25, 0.10, 0.05],  # HomeCenter
+    [0.70, 0.20, 0.05, 0.05],  # Amazon
+    [0.65, 0.25, 0.05, 0.05],  # MercadoLibre
+]
+# Calificaciones de 1-5 estrellas: (media, desviación) por canal
+RATINGS = [(4.2, 0.8), (4.4, 0.7), (4.0, 0.9)]
+PRICE_COLUMNS = ["precio", "precio_homecenter", "precio_amazon", "precio_mercadolibre"]
+
+def _sample(u, weights):
+    """Índice de la opción elegida para cada uniforme de `u` (CDF inversa)"""
+    # Pocas opciones: sumar comparaciones contra cada corte es más rápido que searchsorted
+    codes = np.zeros(u.shape, dtype="int8")
+    for cut in np.cumsum(weights)[:-1]:
+        codes += u >= cut
+    return codes
+
+def draw_synthetic(rng, n, months=5):
+    """Todos los valores aleatorios de un bloque de `n` filas y sus `months` copias.
+
+    Una sola llamada al generador por distribución, con todas las copias y canales
+    a la vez; la disponibilidad sale como códigos de AVAILABILITY_OPTIONS.
+    """
+    availability = rng.random((len(CHANNELS), n))
+    means, stds = np.array(RATINGS).T
+    ratings = rng.standard_normal((len(CHANNELS), n))
+    ratings *= stds[:, None]
+    ratings += means[:, None]
+    return {
+        # Fila 0: original; filas 1..months: copias desplazadas
+        "satisfaccion": _sample(rng.random((months + 1, n)), SATISFACTION_WEIGHTS).astype("int64") + 1,
+        # Amazon 5-15% más barato; MercadoLibre entre -10% y +20%
+        "variacion_canal": rng.uniform([[0.05], [-0.10]], [[0.15], [0.20]], size=(2, n)),
+        "disponibilidad": np.stack([_sample(u, w) for u, w in zip(availability, AVAILABILITY_WEIGHTS)]),
+        "calificaciones": np.round(np.clip(ratings, 1, 5, out=ratings), 1, out=ratings),
+        "dias": rng.integers(0, 28, size=(months, n), dtype="int16"),
+        "variacion_precio": rng.uniform(0.95, 1.05, size=(months, n)),
+    }
+
+def build_block(raw, draws, months=5):
+    """Arma [original] + `months` copias desplazadas un mes cada una a partir de `draws`"""
+    df = raw.copy()
+    df["fecha_venta"] = pd.to_datetime(df["fecha_venta"], dayfirst=True, errors="coerce")
+    df["satisfaccion_cliente"] = draws["satisfaccion"][0]
+
+    # Precios por canal: HomeCenter es el precio base
+    base_prices = df["precio"].to_numpy(dtype="float64")
+    df["precio_homecenter"] = base_prices
+    df["precio_amazon"] = base_prices * (1 - draws["variacion_canal"][0])
+    df["precio_mercadolibre"] = base_prices * (1 + draws["variacion_canal"][1])
+
+    for i, channel in enumerate(CHANNELS):
+        df[f"disponibilidad_{channel}"] = pd.Categorical.from_codes(draws["disponibilidad"][i],
+                                                                    AVAILABILITY_OPTIONS)
+    for i, channel in enumerate(CHANNELS):
+        df[f"calificacion_{channel}"] = draws["calificaciones"][i]
+
+    parts = [df]
+    for offset in range(1, months + 1):
+        tmp = df.copy()
+        tmp["fecha_venta"] = (tmp["fecha_venta"] + pd.DateOffset(months=offset)
+                              + pd.to_timedelta(draws["dias"][offset - 1], unit="D"))
+        # Variar ligeramente los precios y satisfacción en el tiempo
+        for col in PRICE_COLUMNS:
+            tmp[col] = tmp[col] * draws["variacion_precio"][offset - 1]
+        tmp["satisfaccion_cliente"] = draws["satisfaccion"][offset]
+        parts.append(tmp)
+    return parts
+
+def clip_prices(df):
+    """Asegurar que los precios sean positivos"""
+    for col in PRICE_COLUMNS:
+        # Siempre float64: así cada bloque se escribe igual que el dataset concatenado
+        df[col] = df[col].clip(lower=1000).astype("float64")  # Precio mínimo de $1,000
+    return df
+
+def block_rng(seed, block):
+    """Generador independiente para un bloque de BLOCK_ROWS filas de entrada"""
+    # Equivale a SeedSequence(seed).spawn(...)[block]: cada bloque tiene su propio
+    # flujo, así que el resultado no depende de cómo se agrupen los bloques en chunks
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(block,)))
+
+def generate_block(raw, seed, block, months=5):
+    """Genera las `months + 1` versiones (original y desplazadas) de un bloque de entrada"""
+    draws = draw_synthetic(block_rng(seed, block), len(raw), months)
+    return [clip_prices(part) for part in build_block(raw, draws, months)]
+
+def generate(raw, seed, months=5):
+    """Camino batch: todo el dataset en memoria, ordenado por desplazamiento como siempre"""
+    by_offset = [[] for _ in range(months + 1)]
+    for block, start in enumerate(range(0, len(raw), BLOCK_ROWS)):
+        parts = generate_block(raw.iloc[start:start + BLOCK_ROWS], seed, block, months)
+        for offset, part in enumerate(parts):
+            by_offset[offset].append(part)
+    return pd.concat([part for parts in by_offset for part in parts], ignore_index=True)
+
+def _common_type(types):
+    """Tipo que representa los valores de todos los shards sin perder ninguno"""
+    if len(types) == 1:
+        return types.pop()
+    if all(pa.types.is_dictionary(t) for t in types):
+        # Cada shard compacta sus categorías: el índice más ancho alcanza para todos
+        index = max((t.index_type for t in types), key=lambda t: t.bit_width)
+        return pa.dictionary(index, next(iter(types)).value_type)
+    if all(pa.types.is_integer(t) for t in types):
+        return max(types, key=lambda t: t.bit_width)
+    if all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in types):
+        # Un bloque sin decimales infiere int64 y otro float64; float32 solo si cabe en todos
+        return pa.float64()
+    raise ValueError(f"Tipos incompatibles entre shards: {types}")
+
+def _common_schema(schemas):
+    """Esquema único para los shards, cada uno compactado por separado"""
+    fields = [field.with_type(_common_type({schema.field(field.name).type for schema in schemas}))
+              for field in schemas[0]]
+    return pa.schema(fields, metadata=schemas[0].metadata)
+
+def _common_categories(shards, schema):
+    """Categorías de todo el dataset, ordenadas como las deja storage.compact en el camino batch"""
+    names = [field.name for field in schema if pa.types.is_dictionary(field.type)]
+    values = {name: set() for name in names}
+    for shard in shards:
+        table = pq.read_table(shard, columns=names)
+        for name in names:
+            for chunk in table[name].chunks:
+                values[name].update(chunk.dictionary.to_pylist())
+    return {name: pa.array(sorted(v), type=schema.field(name).type.value_type) for name, v in values.items()}
+
+def _recode(table, categories, schema):
+    """Reescribe los índices de cada columna diccionario contra las categorías comunes"""
+    for name, dictionary in categories.items():
+        index_type = schema.field(name).type.index_type
+        chunks = [pa.DictionaryArray.from_arrays(
+                      pc.take(pc.index_in(chunk.dictionary, value_set=dictionary), chunk.indices).cast(index_type),
+                      dictionary)
+                  for chunk in table[name].chunks]
+        table = table.set_column(table.schema.get_field_index(name), name, pa.chunked_array(chunks, schema.field(name).type))
+    return table
+
+def _index_type(n_categories):
+    """Menor índice entero con signo para `n_categories`, igual que pandas"""
+    for index_type in (pa.int8(), pa.int16(), pa.int32()):
+        if n_categories < 2 ** (index_type.bit_width - 1):
+            return index_type
+    return pa.int64()
+
+def block_chunk_rows(chunk_rows):
+    """Filas por chunk que usa generate_streaming: múltiplo de BLOCK_ROWS, como mínimo uno.
+
+    Cada bloque debe quedar entero en un chunk para usar su propia semilla, así que
+    `chunk_rows` se redondea hacia abajo al múltiplo más cercano (y 65.536 si es menor).
+    """
+    return max(BLOCK_ROWS, chunk_rows // BLOCK_ROWS * BLOCK_ROWS)
+
+def generate_streaming(input_path, seed, chunk_rows, months=5, csv_path="data_aug.csv",
+                       parquet_path="data_aug.parquet"):
+    """Camino por chunks: memoria acotada por `chunk_rows` sin importar el tamaño de la entrada.
+
+    Cada desplazamiento se escribe en su propio archivo temporal y al final se
+    concatenan en el mismo orden que el camino batch, así que con la misma semilla
+    el CSV es idéntico y el Parquet carga exactamente el mismo dataset.
+    """
+    chunk_rows = block_chunk_rows(chunk_rows)
+    shard_dir = tempfile.mkdtemp(prefix="data_aug_", dir=os.path.dirname(os.path.abspath(csv_path)))
+    csv_shards = [os.path.join(shard_dir, f"offset-{i}.csv") for i in range(months + 1)]
+    parquet_shards = [[] for _ in range(months + 1)]
+    total = 0
+    try:
+        reader = pd.read_csv(input_path, chunksize=chunk_rows, **storage.CSV_OPTIONS)
+        for chunk_index, chunk in enumerate(reader):
+            first_block = chunk_index * chunk_rows // BLOCK_ROWS
+            for block, start in enumerate(range(0, len(chunk), BLOCK_ROWS), start=first_block):
+                parts = generate_block(chunk.iloc[start:start + BLOCK_ROWS], seed, block, months)
+                for offset, part in enumerate(parts):
+                    header = block == 0
+                    part.to_csv(csv_shards[offset], mode="w" if header else "a", header=header,
+                                index=False, sep="\t", encoding="latin1")
+                    # Mismos tipos en disco que el camino batch (categóricas como diccionario)
+                    shard = os.path.join(shard_dir, f"offset-{offset}-{block:06d}.parquet")
+                    storage.write_dataset(ingest.enrich(part), shard)
+                    parquet_shards[offset].append(shard)
+                    total += len(part)
+
+        # Ensamblar en orden de desplazamiento (mismo orden que el camino batch), en
+        # archivos temporales que reemplazan a los finales recién cuando están completos
+        with open(csv_path + ".tmp", "wb") as out:
+            for offset, shard in enumerate(csv_shards):
+                with open(shard, "rb") as src:
+                    if offset > 0:
+                        src.readline()  # encabezado repetido
+                    shutil.copyfileobj(src, out)
+        shards = [shard for shards in parquet_shards for shard in shards]
+        schema = _common_schema([pq.read_schema(shard) for shard in shards])
+        # Cada shard tiene su propio diccionario: se unifican en uno solo y ordenado,
+        # así el Parquet carga con las mismas categorías que el escrito en un paso
+        categories = _common_categories(shards, schema)
+        for name, dictionary in categories.items():
+            field = schema.field(name)
+            schema = schema.set(schema.get_field_index(name),
+                                field.with_type(pa.dictionary(_index_type(len(dictionary)), field.type.value_type)))
+        with pq.ParquetWriter(parquet_path + ".tmp", schema) as out:
+            for shard in shards:
+                out.write_table(_recode(pq.read_table(shard), categories, schema).cast(schema))
+        os.replace(csv_path + ".tmp", csv_path)
+        os.replace(parquet_path + ".tmp", parquet_path)
+    finally:
+        shutil.rmtree(shard_dir, ignore_errors=True)
+    return total
+
+# Dataset de entrada de cada worker (se lee una vez por proceso, no por tarea)
+_SOURCE = None
+
+def _init_worker(input_path):
+    global _SOURCE
+    _SOURCE = pd.read_csv(input_path, **storage.CSV_OPTIONS)
+
+def _write_parts(task):
+    """Tarea de un worker: genera el bloque `block` y lo escribe como partes finales por mes"""
+    output, seed, block, n_rows, months, part_id = task
+    # Las filas de entrada se recorren en ciclo para llegar a cualquier tamaño
+    per_copy = -(-n_rows // (months + 1))
+    idx = (block * BLOCK_ROWS + np.arange(per_copy)) % len(_SOURCE)
+    parts = generate_block(_SOURCE.take(idx).reset_index(drop=True), seed, block, months)
+    enriched = storage.compact(ingest.enrich(pd.concat(parts, ignore_index=True).head(n_rows)))
+    return [partitions.write_part(output, month, rows, part_id)
+            for month, rows in partitions.months(enriched)]
+
+def generate_parallel(input_path, n_rows, seed, workers, output="data_aug", months=5):
+    """Genera `n_rows` filas en un pool de procesos, escribiendo el dataset particionado.
+
+    Cada tarea es un bloque con su propio flujo aleatorio (ver block_rng) y escribe
+    directamente sus partes finales (filas + cubo) por mes, con el id `next_id + bloque`;
+    el proceso principal solo registra el manifiesto. Al cargar, PartitionCache junta
+    las partes de un mismo mes y merge_cubes sus cubos, así que el resultado es el
+    mismo con cualquier número de workers.
+    """
+    rows_per_task = BLOCK_ROWS * (months + 1)
+    part_id = partitions.read_manifest(output)["next_id"]
+    os.makedirs(output, exist_ok=True)
+    tasks = [(output, seed, block, min(rows_per_task, n_rows - start), months, part_id + block)
+             for block, start in enumerate(range(0, n_rows, rows_per_task))]
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(input_path,)) as pool:
+        # pool.map conserva el orden de los bloques: el manifiesto no depende de los workers
+        parts = [part for written in pool.map(_write_parts, tasks) for part in written]
+    partitions.register(output, parts, part_id + len(tasks))
+    return parts
+
+def print_columns():
+    print("📊 Nuevas columnas agregadas:")
+    print("   - satisfaccion_cliente (1-5)")
+    print("   - precio_homecenter, precio_amazon, precio_mercadolibre")
+    print("   - disponibilidad_homecenter, disponibilidad_amazon, disponibilidad_mercadolibre")
+    print("   - calificacion_homecenter, calificacion_amazon, calificacion_mercadolibre")
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera el dataset de ventas del dashboard")
+    parser.add_argument("--input", default="data.csv", help="ventas originales (CSV separado por tabs)")
+    parser.add_argument("--partitioned", action="store_true",
+                        help="escribir el dataset particionado por mes en --output")
+    parser.add_argument("--append", metavar="CSV",
+                        help="agregar solo estas ventas nuevas al dataset particionado")
+    parser.add_argument("--output", default="data_aug", help="directorio del dataset particionado")
+    parser.add_argument("--seed", type=int, help="semilla para reproducir exactamente el dataset")
+    parser.add_argument("--chunksize", type=int,
+                        help=f"procesar data.csv por chunks de este tamaño (memoria acotada; "
+                             f"se redondea a múltiplos de {BLOCK_ROWS})")
+    parser.add_argument("--rows", type=int,
+                        help="generar exactamente estas filas en paralelo (dataset particionado en --output)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="procesos para --rows (por defecto, uno por núcleo)")
+    args = parser.parse_args()
+    # Sin semilla explícita se toma entropía del sistema y se informa para poder repetir
+    seed = args.seed if args.seed is not None else np.random.SeedSequence().entropy
+
+    if args.append:
+        if not partitions.read_manifest(args.output)["parts"]:
+            # Sin esto se crearía un dataset nuevo que find_dataset preferiría a data_aug.parquet
+            parser.error(f"{args.output}/ no es un dataset particionado; genérelo antes con --partitioned")
+        # Incremental: solo se enriquecen y escriben las particiones de las ventas nuevas
+        new_rows = generate(pd.read_csv(args.append, **storage.CSV_OPTIONS), seed, months=0)
+        added = partitions.append(args.output, new_rows)
+        print(f"✅ Agregadas {len(new_rows)} filas en {len(added)} partición(es) de {args.output}/")
+        for part in added:
+            print(f"   - {part['file']} ({part['rows']} filas)")
+        return
+
+    if args.rows:
+        if partitions.read_manifest(args.output)["parts"]:
+            parser.error(f"{args.output}/ ya existe; use --append para agregar ventas nuevas")
+        written = generate_parallel(args.input, args.rows, seed, args.workers, args.output)
+        print(f"✅ Generado {args.output}/ con", args.rows, "filas en", len(written), "particiones",
+              f"({args.workers} procesos)")
+        print(f"🎲 Semilla: {seed}")
+        print_columns()
+        return
+
+    if args.chunksize:
+        if args.partitioned:
+            parser.error("--chunksize genera data_aug.csv y data_aug.parquet; no admite --partitioned")
+        chunk_rows = block_chunk_rows(args.chunksize)
+        if chunk_rows != args.chunksize:
+            print(f"ℹ️  --chunksize ajustado a {chunk_rows} filas (múltiplo de {BLOCK_ROWS})")
+        total = generate_streaming(args.input, seed, chunk_rows)
+        print("✅ Generado data_aug.csv y data_aug.parquet con", total, "filas (por chunks)")
+        print(f"🎲 Semilla: {seed}")
+        print_columns()
+        return
+
+    df_aug = generate(pd.read_csv(args.input, **storage.CSV_OPTIONS), seed)
+
+    if args.partitioned:
+        if partitions.read_manifest(args.output)["parts"]:
+            parser.error(f"{args.output}/ ya existe; use --append para agregar ventas nuevas")
+        added = partitions.append(args.output, df_aug)
+        print(f"✅ Generado {args.output}/ con", len(df_aug), "filas en", len(added), "particiones")
+        print(f"🎲 Semilla: {seed}")
+        print_columns()
+        return
+
+    storage.write_dataset(df_aug, "data_aug.csv")
+    # El Parquet se guarda enriquecido y compacto para que el dashboard no recalcule nada
+    df_enriched = ingest.enrich(df_aug)
+    storage.write_dataset(df_enriched, "data_aug.parquet")
+    memory = storage.memory_report(df_enriched, storage.compact(df_enriched))
+
+    print("✅ Generado data_aug.csv y data_aug.parquet con", len(df_aug), "filas")
+    print(f"🎲 Semilla: {seed}")
+    print_columns()
+    print(f"🗜️  Memoria en el dashboard: {memory['before_mb']:.1f} MB -> {memory['after_mb']:.1f} MB")
 
-df = pd.read_csv("data.csv", sep="\t", encoding="latin1")
-df["fecha_venta"] = pd.to_datetime(df["fecha_venta"], dayfirst=True, errors="coerce")
-
-# Agregar satisfacción del cliente (puntaje 1-5)
-def generate_satisfaction_score():
-    """Genera puntajes de satisfacción realistas basados en distribución normal"""
-    # 70% de clientes satisfechos (4-5), 20% neutral (3), 10% insatisfechos (1-2)
-    weights = [0.05, 0.05, 0.20, 0.40, 0.30]  # Probabilidades para puntajes 1-5
-    return np.random.choice([1, 2, 3, 4, 5], size=len(df), p=weights)
-
-df["satisfaccion_cliente"] = generate_satisfaction_score()
-
-# Agregar precios por canal de venta
-def generate_channel_prices():
-    """Genera precios para diferentes canales con variaciones realistas"""
-    base_prices = df["precio"].values
-    
-    # HomeCenter (precio base)
-    homecenter_prices = base_prices
-    
-    # Amazon (generalmente 5-15% más barato)
-    amazon_discount = np.random.uniform(0.05, 0.15, len(df))
-    amazon_prices = base_prices * (1 - amazon_discount)
-    
-    # MercadoLibre (puede ser más barato o más caro, variación -10% a +20%)
-    ml_variation = np.random.uniform(-0.10, 0.20, len(df))
-    mercadolibre_prices = base_prices * (1 + ml_variation)
-    
-    return homecenter_prices, amazon_prices, mercadolibre_prices
-
-homecenter_prices, amazon_prices, mercadolibre_prices = generate_channel_prices()
-
-df["precio_homecenter"] = homecenter_prices
-df["precio_amazon"] = amazon_prices
-df["precio_mercadolibre"] = mercadolibre_prices
-
-# Agregar disponibilidad por canal
-def generate_channel_availability():
-    """Genera disponibilidad realista por canal"""
-    availability_options = ["Disponible", "Consultar", "Agotado", "Envío 24h"]
-    weights = [0.60, 0.25, 0.10, 0.05]  # Probabilidades
-    
-    homecenter_avail = np.random.choice(availability_options, size=len(df), p=weights)
-    amazon_avail = np.random.choice(availability_options, size=len(df), p=[0.70, 0.20, 0.05, 0.05])
-    ml_avail = np.random.choice(availability_options, size=len(df), p=[0.65, 0.25, 0.05, 0.05])
-    
-    return homecenter_avail, amazon_avail, ml_avail
-
-homecenter_avail, amazon_avail, mercadolibre_avail = generate_channel_availability()
-
-df["disponibilidad_homecenter"] = homecenter_avail
-df["disponibilidad_amazon"] = amazon_avail
-df["disponibilidad_mercadolibre"] = mercadolibre_avail
-
-# Agregar calificaciones por canal
-def generate_channel_ratings():
-    """Genera calificaciones de productos por canal"""
-    # Calificaciones de 1-5 estrellas
-    homecenter_ratings = np.random.normal(4.2, 0.8, len(df)).clip(1, 5)
-    amazon_ratings = np.random.normal(4.4, 0.7, len(df)).clip(1, 5)
-    ml_ratings = np.random.normal(4.0, 0.9, len(df)).clip(1, 5)
-    
-    return homecenter_ratings, amazon_ratings, ml_ratings
-
-homecenter_ratings, amazon_ratings, ml_ratings = generate_channel_ratings()
-
-df["calificacion_homecenter"] = homecenter_ratings.round(1)
-df["calificacion_amazon"] = amazon_ratings.round(1)
-df["calificacion_mercadolibre"] = ml_ratings.round(1)
-
-# Generar datos aumentados
-augments = []
-for offset in range(1, 6):        # 5 meses extra
-    tmp = df.copy()
-    tmp["fecha_venta"] = tmp["fecha_venta"] + pd.DateOffset(months=offset)
-    tmp["fecha_venta"] += pd.to_timedelta(
-        np.random.randint(0, 28, size=len(tmp)), unit="D"
-    )
-    
-    # Variar ligeramente los precios y satisfacción en el tiempo
-    price_variation = np.random.uniform(0.95, 1.05, len(tmp))
-    tmp["precio"] = tmp["precio"] * price_variation
-    tmp["precio_homecenter"] = tmp["precio_homecenter"] * price_variation
-    tmp["precio_amazon"] = tmp["precio_amazon"] * price_variation
-    tmp["precio_mercadolibre"] = tmp["precio_mercadolibre"] * price_variation
-    
-    # Regenerar satisfacción para variar en el tiempo
-    tmp["satisfaccion_cliente"] = generate_satisfaction_score()
-    
-    augments.append(tmp)
-
-df_aug = pd.concat([df] + augments, ignore_index=True)
-
-# Asegurar que los precios sean positivos
-price_columns = ["precio", "precio_homecenter", "precio_amazon", "precio_mercadolibre"]
-for col in price_columns:
-    df_aug[col] = df_aug[col].clip(lower=1000)  # Precio mínimo de $1,000
-
-df_aug.to_csv("data_aug.csv", sep="\t", index=False, encoding="latin1")
-
-print("✅ Generado data_aug.csv con", len(df_aug), "filas")
-print("📊 Nuevas columnas agregadas:")
-print("   - satisfaccion_cliente (1-5)")
-print("   - precio_homecenter, precio_amazon, precio_mercadolibre")
-print("   - disponibilidad_homecenter, disponibilidad_amazon, disponibilidad_mercadolibre")
-print("   - calificacion_homecenter, calificacion_amazon, calificacion_mercadolibre")
+if __name__ == "__main__":
+    main()
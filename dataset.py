@@ -0,0 +1,64 @@
+# dataset.py  (dataset en memoria compartido entre sesiones del dashboard)
+
+import numpy as np
+import pandas as pd
+
+
+def _readonly(series: pd.Series):
+    """Valores de `series` sin copiar, marcados como de solo lectura"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # `.codes` ya es una vista de solo lectura; se reconstruye la categórica sobre ella
+        codes = np.asarray(series.array.codes)
+        return pd.Categorical.from_codes(codes, dtype=series.dtype, validate=False)
+    if isinstance(series.dtype, np.dtype):
+        values = series.to_numpy()
+        values.flags.writeable = False
+        return values
+    # Arrays de Arrow (p. ej. strings en pandas 3) son inmutables por construcción
+    return series.array
+
+
+def freeze(df: pd.DataFrame) -> pd.DataFrame:
+    """Construye un DataFrame cuyos buffers no pueden modificarse.
+
+    El resultado comparte memoria con `df`, que no debe seguir usándose. Cualquier
+    escritura en el lugar (p. ej. `frozen.loc[0, 'precio'] = 1`) falla con ValueError.
+    """
+    columns = {col: _readonly(df[col]) for col in df.columns}
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+class DateIndex:
+    """Índice de un DataFrame ordenado por `fecha_venta_dt` para filtrar sin máscaras.
+
+    Un rango de fechas se resuelve con búsqueda binaria (`searchsorted`): con 'All' el
+    resultado es una vista contigua (`iloc[lo:hi]`); con una categoría se usan las
+    posiciones de esa categoría, que también están ordenadas por fecha, y solo se
+    copian las filas que coinciden.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        dates = df["fecha_venta_dt"].to_numpy()
+        if len(dates) and not (dates[1:] >= dates[:-1]).all():
+            raise ValueError("El DataFrame debe estar ordenado por fecha_venta_dt")
+        self.dates = dates
+        codes, categories = pd.factorize(df["categoria"])
+        # argsort estable: dentro de cada categoría las posiciones siguen en orden de fecha
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(categories) + 1))
+        self.positions = {cat: order[bounds[i]:bounds[i + 1]] for i, cat in enumerate(categories)}
+        self.category_dates = {cat: dates[pos] for cat, pos in self.positions.items()}
+
+    def slice(self, df: pd.DataFrame, start_d, end_d, selected_cat: str = "All") -> pd.DataFrame:
+        """Equivalente a `aggregations.filter_rows` (fechas inclusivas en ambos extremos)"""
+        # Misma unidad que el índice para que searchsorted no convierta todo el arreglo
+        start = np.datetime64(pd.to_datetime(start_d)).astype(self.dates.dtype)
+        end = np.datetime64(pd.to_datetime(end_d)).astype(self.dates.dtype)
+        if selected_cat == "All":
+            lo, hi = np.searchsorted(self.dates, start, side="left"), np.searchsorted(self.dates, end, side="right")
+            return df.iloc[lo:hi]
+        dates = self.category_dates.get(selected_cat)
+        if dates is None:
+            return df.iloc[:0]
+        lo, hi = np.searchsorted(dates, start, side="left"), np.searchsorted(dates, end, side="right")
+        return df.take(self.positions[selected_cat][lo:hi])
@@ -0,0 +1,82 @@
+# engines.py  (motores de consulta: qué se arma por versión del dataset y cómo se filtra)
+#
+# Independiente de Streamlit: lo usan el dashboard (app.py) y la API HTTP (api.py).
+#
+#   rollup  cubo diario en memoria; cada filtro recorre el cubo (por defecto)
+#   rows    DataFrame en memoria; cada filtro toma las filas del rango vía índice de fechas
+#   scan    el dataset queda en disco; cada filtro es una consulta sobre los archivos
+#
+# Con `approximate` (solo rollup y rows) se arman además los sketches de sketches.py
+# para responder los KPIs sin recorrer el cubo por producto.
+
+from __future__ import annotations
+
+import os
+
+import pandas as pd
+
+import aggregations
+import dataset
+import ingest
+import partitions
+import rollup
+import scan
+import sketches
+import storage
+
+ENGINES = ['rollup', 'rows', 'scan']
+
+
+def options_from_env() -> dict:
+    """Motor y modo aproximado según DASHBOARD_ENGINE, DASHBOARD_APPROX y DASHBOARD_HLL_PRECISION"""
+    engine = os.environ.get('DASHBOARD_ENGINE', 'rollup')
+    if engine not in ENGINES:
+        raise ValueError(f'DASHBOARD_ENGINE debe ser uno de {ENGINES}: {engine!r}')
+    return {
+        'engine': engine,
+        'approximate': os.environ.get('DASHBOARD_APPROX') == '1' and engine != 'scan',
+        'precision': int(os.environ.get('DASHBOARD_HLL_PRECISION', sketches.PRECISION)),
+    }
+
+
+def build(path: str, engine: str = 'rollup', approximate: bool = False, precision: int = sketches.PRECISION,
+          partition_cache: partitions.PartitionCache | None = None) -> dict:
+    """Todo lo que necesita `engine` para una versión del dataset (ver snapshot.py).
+
+    Parquet/Feather traen fechas, categóricas y columnas derivadas precalculadas; CSV
+    queda como importación y se enriquece al cargar. `partition_cache` permite leer solo
+    las particiones nuevas de un dataset particionado entre una versión y la siguiente.
+    """
+    if engine == 'scan':
+        # Solo se recorren fechas y llaves para conocer el rango y las categorías
+        source = scan.ScanEngine(path)
+        return {'scan': source, 'bounds': (source.min_date, source.max_date, source.categories)}
+    if storage.detect_format(path) == 'partitioned':
+        # Cada partición trae su cubo precalculado en la ingesta
+        df, cube = (partition_cache or partitions.PartitionCache()).load(path)
+    else:
+        df, cube = dataset.freeze(ingest.load_dataset(path)), None
+    resources = {
+        'df': df,
+        'bounds': (df['fecha_venta_dt'].min(), df['fecha_venta_dt'].max(),
+                   sorted(df['categoria'].dropna().unique())),
+    }
+    if engine == 'rows':
+        # Posiciones por fecha y categoría para filtrar filas por búsqueda binaria
+        resources['index'] = dataset.DateIndex(df)
+    if engine != 'rows' or approximate:
+        resources['cube'] = cube if cube is not None else dataset.freeze(rollup.build_cube(df))
+    if approximate:
+        # Totales y HyperLogLog de productos por (categoría, día)
+        resources['sketches'] = sketches.DistinctSketches(resources['cube'], precision)
+    return resources
+
+
+def partials(resources: dict, start_d, end_d, selected_cat: str = 'All') -> pd.DataFrame:
+    """Agregados parciales del filtro con el motor para el que se armó `resources`"""
+    if 'scan' in resources:
+        return resources['scan'].partials(start_d, end_d, selected_cat)
+    if 'index' in resources:
+        rows = resources['index'].slice(resources['df'], start_d, end_d, selected_cat)
+        return aggregations.partial_aggregates(rows)
+    return rollup.slice_cube(resources['cube'], start_d, end_d, selected_cat)
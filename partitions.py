@@ -0,0 +1,153 @@
+# partitions.py  (dataset particionado por mes con ingesta incremental)
+#
+# Estructura en disco:
+#   data_aug/_manifest.json                 lista de partes, en orden de ingesta
+#   data_aug/mes=2024-01/part-000001.parquet  filas enriquecidas y compactas
+#   data_aug/mes=2024-01/cube-000001.parquet  cubo diario de esas mismas filas
+#
+# Agregar ventas nuevas escribe solo partes nuevas (filas + cubo) y reemplaza el
+# manifiesto de forma atómica; nunca se reescriben las partes existentes.
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+
+import pandas as pd
+
+import dataset
+import ingest
+import rollup
+import storage
+
+
+def read_manifest(root: str) -> dict:
+    """Manifiesto del dataset (vacío si el directorio todavía no existe)"""
+    path = os.path.join(root, storage.MANIFEST)
+    if not os.path.exists(path):
+        return {"next_id": 1, "parts": []}
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def _write_manifest(root: str, manifest: dict) -> None:
+    """Escribe el manifiesto en un archivo temporal y lo reemplaza atómicamente"""
+    path = os.path.join(root, storage.MANIFEST)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2)
+    os.replace(tmp, path)
+
+
+def months(enriched: pd.DataFrame):
+    """(mes "AAAA-MM", filas) de un DataFrame enriquecido, en orden de mes"""
+    return enriched.groupby(enriched["fecha_venta_dt"].dt.strftime("%Y-%m"), sort=True)
+
+
+def write_part(root: str, month: str, rows: pd.DataFrame, part_id: int) -> dict:
+    """Escribe las filas ya enriquecidas y compactas de `month` como la parte `part_id` (filas + cubo)"""
+    folder = f"mes={month}"
+    os.makedirs(os.path.join(root, folder), exist_ok=True)
+    part = {
+        "file": f"{folder}/part-{part_id:06d}.parquet",
+        "cube": f"{folder}/cube-{part_id:06d}.parquet",
+        "rows": len(rows),
+        "min_date": str(rows["fecha_venta_dt"].min()),
+        "max_date": str(rows["fecha_venta_dt"].max()),
+    }
+    rows = rows.reset_index(drop=True)
+    storage.write_dataset(rows, os.path.join(root, part["file"]))
+    storage.write_dataset(rollup.build_cube(rows), os.path.join(root, part["cube"]))
+    return part
+
+
+def write_parts(root: str, raw: pd.DataFrame, part_id: int) -> list[dict]:
+    """Enriquece `raw` y lo escribe como una parte por mes con número `part_id`.
+
+    No toca el manifiesto: el llamador registra las partes devueltas. Cada mes va en
+    su propia carpeta, así que varios procesos pueden escribir a la vez con ids distintos.
+    """
+    enriched = storage.compact(ingest.enrich(raw))
+    return [write_part(root, month, rows, part_id) for month, rows in months(enriched)]
+
+
+def register(root: str, parts: list[dict], next_id: int) -> None:
+    """Agrega `parts` al manifiesto y reserva los ids menores a `next_id`"""
+    manifest = read_manifest(root)
+    manifest["parts"].extend(parts)
+    manifest["next_id"] = max(manifest["next_id"], next_id)
+    _write_manifest(root, manifest)
+
+
+def append(root: str, raw: pd.DataFrame) -> list[dict]:
+    """Enriquece `raw`, lo escribe como partes nuevas por mes y actualiza el manifiesto"""
+    part_id = read_manifest(root)["next_id"]
+    added = write_parts(root, raw, part_id)
+    register(root, added, part_id + 1)
+    return added
+
+
+def concat_frames(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    """Concatena partes conservando las columnas categóricas (unión de categorías)"""
+    frames = [f for f in frames if len(f)] or frames[:1]
+    if len(frames) == 1:
+        return frames[0]
+    aligned = [f.copy(deep=False) for f in frames]
+    for col in frames[0].columns:
+        if isinstance(frames[0][col].dtype, pd.CategoricalDtype):
+            categories = pd.api.types.union_categoricals([f[col] for f in frames]).categories
+            for f in aligned:
+                f[col] = f[col].cat.set_categories(categories)
+    return pd.concat(aligned, ignore_index=True)
+
+
+def merge_cubes(cube: pd.DataFrame | None, new: list[pd.DataFrame]) -> pd.DataFrame:
+    """Incorpora los cubos de partes nuevas a `cube` sin repetir grupos.
+
+    Un mismo (día, categoría, producto) puede estar en varias partes; solo se re-agrupan
+    los días desde el primero de las partes nuevas, el resto del cubo queda como está.
+    """
+    added = concat_frames(new)
+    if cube is None:
+        return rollup.combine(added)
+    overlap = cube["dia"] >= added["dia"].min()
+    merged = rollup.combine(concat_frames([cube[overlap], added]))
+    return concat_frames([cube[~overlap].reset_index(drop=True), merged])
+
+
+class PartitionCache:
+    """Dataset y cubo combinados que se actualizan leyendo solo las partes nuevas.
+
+    Si el manifiesto perdió partes (p. ej. se regeneró el dataset) se recarga todo.
+    """
+
+    def __init__(self):
+        self.loaded = []
+        self.df = None
+        self.cube = None
+        self._lock = threading.Lock()
+
+    def load(self, root: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """Devuelve (filas, cubo) congelados, incorporando las partes agregadas desde la última llamada"""
+        with self._lock:
+            parts = read_manifest(root)["parts"]
+            if not parts:
+                raise ValueError(f"El dataset {root} no tiene particiones")
+            # Se comparan las entradas completas: un dataset regenerado reutiliza los nombres
+            if parts[:len(self.loaded)] != self.loaded:
+                self.loaded, self.df, self.cube = [], None, None
+            new = parts[len(self.loaded):]
+            if new or self.df is None:
+                frames = [ingest.load_dataset(os.path.join(root, p["file"])) for p in new]
+                cubes = [storage.read_dataset(os.path.join(root, p["cube"])) for p in new]
+                if self.df is not None:
+                    frames.insert(0, self.df)
+                df = concat_frames(frames)
+                if not df["fecha_venta_dt"].is_monotonic_increasing:
+                    # Ventas atrasadas: se reordena para mantener el índice de fechas
+                    df = df.sort_values("fecha_venta_dt", kind="stable", ignore_index=True)
+                self.df = dataset.freeze(df)
+                self.cube = dataset.freeze(merge_cubes(self.cube, cubes))
+                self.loaded = parts
+            return self.df, self.cube
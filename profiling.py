@@ -0,0 +1,127 @@
+# profiling.py  (modo de perfilado: tiempos por etapa, aciertos de caché y memoria)
+#
+# Cada ejecución del script (o de un fragmento) abre un Profiler con `start`; el
+# código marca sus etapas con `stage(...)` sin recibir el perfilador: se toma del
+# contexto del hilo, y si el perfilado está apagado las etapas no hacen nada.
+# Al cerrar, cada etapa se emite como una línea JSON en el logger 'dashboard.profile'.
+
+from __future__ import annotations
+
+import contextvars
+import json
+import logging
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+
+import pandas as pd
+
+logger = logging.getLogger("dashboard.profile")
+if not logger.handlers:
+    # Una línea JSON por registro en stderr, sin el formato de los logs de Streamlit
+    _handler = logging.StreamHandler(sys.stderr)
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+_current = contextvars.ContextVar("profiler", default=None)
+
+
+class Profiler:
+    """Etapas cronometradas de una ejecución, en orden de finalización"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.run_id = uuid.uuid4().hex[:12]
+        self.stages = []
+        self._start = time.perf_counter()
+
+    def record(self, stage: str, ms: float, **fields) -> None:
+        self.stages.append({"stage": stage, "ms": round(ms, 3), **fields})
+
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self._start) * 1000
+
+    def summary(self) -> pd.DataFrame:
+        """Tabla de etapas para mostrar en el dashboard"""
+        return pd.DataFrame(self.stages, columns=["stage", "ms", "cache"] + sorted(
+            {k for s in self.stages for k in s} - {"stage", "ms", "cache"}))
+
+    def finish(self) -> None:
+        """Cierra la ejecución y emite una línea JSON por etapa más una de resumen"""
+        _current.set(None)
+        for entry in self.stages:
+            logger.info(json.dumps({"event": "stage", "run": self.run_id, "name": self.name, **entry},
+                                   default=str))
+        hits = sum(s.get("cache") == "hit" for s in self.stages)
+        misses = sum(s.get("cache") == "miss" for s in self.stages)
+        logger.info(json.dumps({"event": "run", "run": self.run_id, "name": self.name,
+                                "total_ms": round(self.total_ms(), 3), "stages": len(self.stages),
+                                "cache_hits": hits, "cache_misses": misses}))
+
+
+def start(name: str, enabled: bool) -> Profiler | None:
+    """Abre el perfilador de esta ejecución (None si está apagado).
+
+    Reemplaza al que hubiera en el hilo: si una ejecución anterior terminó con una
+    excepción antes de `finish`, sus etapas no se mezclan con las nuevas.
+    """
+    profiler = Profiler(name) if enabled else None
+    _current.set(profiler)
+    return profiler
+
+
+def current() -> Profiler | None:
+    return _current.get()
+
+
+@contextmanager
+def stage(name: str, **fields):
+    """Cronometra el bloque como etapa `name`; el dict que entrega admite más campos"""
+    profiler = _current.get()
+    extra = dict(fields)
+    if profiler is None:
+        yield extra
+        return
+    t0 = time.perf_counter()
+    try:
+        yield extra
+    finally:
+        profiler.record(name, (time.perf_counter() - t0) * 1000, **extra)
+
+
+def cached(name: str, cache, key, compute):
+    """`cache.get_or_compute` como etapa, registrando si fue acierto o fallo"""
+    computed = []
+
+    def wrapped():
+        computed.append(True)
+        return compute()
+
+    with stage(name) as info:
+        value = cache.get_or_compute(key, wrapped)
+        info["cache"] = "miss" if computed else "hit"
+    return value
+
+
+def resource(name: str, load):
+    """Llamada a una función con st.cache_resource como etapa.
+
+    Es un fallo si durante la llamada se ejecutó el cuerpo de la función, que se
+    marca con una etapa `'{name}.compute'`.
+    """
+    profiler = _current.get()
+    before = len(profiler.stages) if profiler else 0
+    with stage(name) as info:
+        value = load()
+        if profiler is not None:
+            computed = any(s["stage"] == f"{name}.compute" for s in profiler.stages[before:])
+            info["cache"] = "miss" if computed else "hit"
+    return value
+
+
+def memory_mb(df: pd.DataFrame) -> float:
+    """Memoria del DataFrame en MB (incluye el texto de categorías y objetos)"""
+    return round(df.memory_usage(deep=True).sum() / 2**20, 2)
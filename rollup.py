@@ -0,0 +1,48 @@
+# rollup.py  (cubo diario día × categoría × producto con sumas y conteos)
+#
+# Todas las métricas del dashboard son sumas, conteos o cocientes de ellos, así que
+# cualquier rango de fechas y categoría se responde sumando filas del cubo en lugar
+# de recorrer las ventas originales.
+
+import pandas as pd
+
+import aggregations
+
+# 'medianoche' distingue las ventas a las 00:00 del día: el filtro del sidebar incluye
+# solo esas en la fecha final (between con fin a medianoche), y así el cubo es exacto
+CUBE_KEYS = aggregations.PARTIAL_KEYS + ['dia', 'medianoche']
+
+
+def build_cube(df: pd.DataFrame) -> pd.DataFrame:
+    """Materializa los agregados parciales de `df` a granularidad diaria"""
+    day = df['fecha_venta_dt'].dt.normalize()
+    rows = df[aggregations.PARTIAL_KEYS + aggregations.VALUE_COLUMNS].assign(
+        dia=day,
+        medianoche=df['fecha_venta_dt'] == day,
+    )
+    return aggregations.partial_aggregates(rows, keys=CUBE_KEYS)
+
+
+def combine(cube: pd.DataFrame) -> pd.DataFrame:
+    """Suma los grupos repetidos de un cubo (p. ej. cubos de varias partes concatenados)"""
+    return (cube.groupby(CUBE_KEYS, as_index=False, sort=False, observed=True, dropna=False)
+            [aggregations.PARTIAL_COLUMNS].sum())
+
+
+def cube_mask(cube: pd.DataFrame, start_d, end_d, selected_cat: str = 'All') -> pd.Series:
+    """Filas del cubo (o de otro agregado con 'dia' y 'medianoche') dentro del filtro"""
+    start, end = pd.to_datetime(start_d), pd.to_datetime(end_d)
+    mask = (cube['dia'] >= start) & ((cube['dia'] < end) | ((cube['dia'] == end) & cube['medianoche']))
+    if selected_cat != 'All':
+        mask &= cube['categoria'] == selected_cat
+    return mask
+
+
+def slice_cube(cube: pd.DataFrame, start_d, end_d, selected_cat: str = 'All') -> pd.DataFrame:
+    """Filas del cubo equivalentes a `aggregations.filter_rows` con el mismo filtro"""
+    return cube[cube_mask(cube, start_d, end_d, selected_cat)]
+
+
+def compute_panels(cube: pd.DataFrame, start_d, end_d, selected_cat: str = 'All') -> dict:
+    """Todos los agregados del dashboard respondidos desde el cubo"""
+    return aggregations.panels_from_partials(slice_cube(cube, start_d, end_d, selected_cat))
@@ -0,0 +1,146 @@
+# scan.py  (motor fuera de memoria: filtros y agregados sobre los archivos columnares)
+#
+# En lugar de cargar el dataset en un DataFrame, cada filtro del sidebar se resuelve
+# con un plan de Arrow (Acero) sobre los archivos Parquet/Feather: lectura de solo las
+# columnas necesarias, filtro empujado al escaneo (estadísticas de row groups y, en un
+# dataset particionado, solo los meses del rango según el manifiesto) y agregación por
+# (categoría, producto) en paralelo y por lotes. Al proceso de Streamlit solo vuelven
+# los agregados parciales, del mismo formato que `aggregations.partial_aggregates`,
+# así que los paneles se derivan igual que en el motor en memoria.
+
+from __future__ import annotations
+
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.acero as acero
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+import aggregations
+import partitions
+import profiling
+import storage
+
+# Formatos de Arrow Dataset para cada formato de storage (CSV no trae las derivadas)
+DATASET_FORMATS = {"parquet": "parquet", "feather": "ipc"}
+
+DATE = "fecha_venta_dt"
+
+
+class ScanEngine:
+    """Dataset en disco consultado por filtro; en memoria solo quedan sus metadatos.
+
+    Al crearse recorre una vez las columnas de fecha y llaves para conocer el rango de
+    fechas, las categorías presentes y el orden de las categorías que tendría el
+    DataFrame cargado por `ingest.load_dataset` (de él depende el orden de los paneles).
+    """
+
+    def __init__(self, path: str):
+        fmt = storage.detect_format(path)
+        if fmt == "partitioned":
+            root = path
+            self.parts = [{**p, "file": os.path.join(root, p["file"])}
+                          for p in partitions.read_manifest(root)["parts"]]
+            if not self.parts:
+                raise ValueError(f"El dataset {root} no tiene particiones")
+            fmt = storage.detect_format(self.parts[0]["file"])
+        else:
+            self.parts = [{"file": path, "min_date": None, "max_date": None}]
+        if fmt not in DATASET_FORMATS:
+            raise ValueError(f"El motor 'scan' necesita Parquet o Feather (ver data_convert.py): {path}")
+        self.format = DATASET_FORMATS[fmt]
+        self.min_date, self.max_date, self.categories, self.key_categories = self._bounds()
+
+    def _dataset(self, files: list[str]) -> ds.Dataset:
+        return ds.dataset(files, format=self.format)
+
+    def _bounds(self):
+        """Rango de fechas, categorías observadas y orden de categorías de cada llave"""
+        keys = aggregations.PARTIAL_KEYS
+        order = {key: {} for key in keys}
+        observed = set()
+        low, high = None, None
+        scanner = self._dataset([p["file"] for p in self.parts]).scanner(columns=[DATE] + keys)
+        for batch in scanner.to_batches():
+            for key in keys:
+                column = batch.column(key)
+                # Categorías en orden de aparición entre lotes y archivos, como al unir
+                # diccionarios en to_pandas y en partitions.concat_frames
+                for value in column.dictionary.to_pylist():
+                    order[key].setdefault(value, None)
+            codes = pc.unique(batch.column("categoria").indices).drop_null()
+            observed.update(batch.column("categoria").dictionary.take(codes).to_pylist())
+            bounds = pc.min_max(batch.column(DATE))
+            if bounds["min"].is_valid:
+                low = bounds["min"].as_py() if low is None else min(low, bounds["min"].as_py())
+                high = bounds["max"].as_py() if high is None else max(high, bounds["max"].as_py())
+        return (pd.Timestamp(low), pd.Timestamp(high), sorted(observed),
+                {key: pd.CategoricalDtype(list(order[key])) for key in keys})
+
+    def _files(self, start, end) -> list[str]:
+        """Partes cuyo rango de fechas del manifiesto se cruza con [start, end]"""
+        return [p["file"] for p in self.parts
+                if p["min_date"] is None or (pd.Timestamp(p["max_date"]) >= start
+                                             and pd.Timestamp(p["min_date"]) <= end)]
+
+    def partials(self, start_d, end_d, selected_cat: str = "All") -> pd.DataFrame:
+        """Equivalente a `partial_aggregates(filter_rows(df, start_d, end_d, selected_cat))`"""
+        start, end = pd.to_datetime(start_d), pd.to_datetime(end_d)
+        condition = (pc.field(DATE) >= pa.scalar(start)) & (pc.field(DATE) <= pa.scalar(end))
+        if selected_cat != "All":
+            condition &= pc.field("categoria") == selected_cat
+
+        with profiling.stage("scan.query") as info:
+            files = self._files(start, end)
+            info["files"] = len(files)
+            table = self._query(files, condition) if files else None
+        return self._to_partials(table)
+
+    def _query(self, files: list[str], condition: pc.Expression) -> pa.Table:
+        keys = aggregations.PARTIAL_KEYS
+        values = aggregations.VALUE_COLUMNS
+        scores = aggregations.SATISFACTION_SCORES
+        # Cada puntaje de satisfacción como 0/1 para contarlo con una suma por grupo
+        projection = ([pc.field(k) for k in keys + values + [DATE]]
+                      + [pc.if_else(pc.field("satisfaccion_cliente") == score, 1, 0) for score in scores])
+        names = keys + values + [DATE] + [f"satisfaccion_{score}" for score in scores]
+
+        aggregates = [(keys[0], "hash_count", pc.CountOptions("all"), "filas")]
+        for col in values:
+            aggregates += [(col, "hash_sum", None, f"{col}_sum"),
+                           (col, "hash_count", pc.CountOptions("only_valid"), f"{col}_n")]
+        aggregates += [(f"satisfaccion_{score}", "hash_sum", None, f"satisfaccion_{score}") for score in scores]
+        # Primera venta del grupo: ordena los grupos como la primera aparición en las filas
+        aggregates.append((DATE, "hash_min", None, "primera_venta"))
+
+        plan = acero.Declaration.from_sequence([
+            acero.Declaration("scan", acero.ScanNodeOptions(self._dataset(files), filter=condition,
+                                                            columns=keys + values + [DATE])),
+            acero.Declaration("filter", acero.FilterNodeOptions(condition)),
+            acero.Declaration("project", acero.ProjectNodeOptions(projection, names)),
+            acero.Declaration("aggregate", acero.AggregateNodeOptions(aggregates, keys=keys)),
+        ])
+        return plan.to_table(use_threads=True)
+
+    def _to_partials(self, table: pa.Table | None) -> pd.DataFrame:
+        """Resultado de Arrow con las columnas, tipos y categorías de `partial_aggregates`"""
+        keys = aggregations.PARTIAL_KEYS
+        if table is None or table.num_rows == 0:
+            empty = {key: pd.Series([], dtype=self.key_categories[key]) for key in keys}
+            return pd.DataFrame({**empty, **{col: pd.Series([], dtype="int64")
+                                             for col in aggregations.PARTIAL_COLUMNS}})
+
+        frame = table.to_pandas()
+        out = pd.DataFrame({key: frame[key].astype(self.key_categories[key]) for key in keys})
+        order = np.lexsort([out[key].cat.codes for key in reversed(keys)] + [frame["primera_venta"]])
+        out["filas"] = frame["filas"]
+        for col in aggregations.VALUE_COLUMNS:
+            integer = pa.types.is_integer(table.schema.field(f"{col}_sum").type)
+            out[f"{col}_sum"] = frame[f"{col}_sum"].fillna(0).astype("int64" if integer else "float64")
+            out[f"{col}_n"] = frame[f"{col}_n"]
+        for score in aggregations.SATISFACTION_SCORES:
+            out[f"satisfaccion_{score}"] = frame[f"satisfaccion_{score}"].fillna(0).astype("int64")
+        return out.iloc[order].reset_index(drop=True)
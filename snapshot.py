@@ -0,0 +1,101 @@
+# snapshot.py  (versiones del dataset: carga en segundo plano y reemplazo atómico)
+#
+# El dashboard no recarga el dataset dentro de una ejecución del script. Un hilo vigila
+# la versión del origen (mtime/tamaño del archivo o del manifiesto) y, cuando cambia,
+# arma la siguiente versión completa (filas, derivadas, cubo, ...) fuera de las sesiones
+# y la publica reemplazando una sola referencia. Cada ejecución toma la versión vigente
+# al empezar y la usa hasta terminar, aunque mientras tanto se publique otra.
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+import storage
+
+logger = logging.getLogger(__name__)
+
+# Segundos entre revisiones del origen
+INTERVAL = 5.0
+
+
+class Snapshot:
+    """Una versión del dataset y lo que se deriva de ella; no cambia una vez publicada"""
+
+    def __init__(self, version: int, source: str, resources: dict):
+        self.version = version
+        self.source = source
+        self.resources = resources
+        self.loaded_at = time.time()
+
+    def __getitem__(self, name: str):
+        return self.resources[name]
+
+
+class SnapshotManager:
+    """Versión vigente del dataset en `path` y el hilo que prepara la siguiente.
+
+    `build(path)` arma los recursos de una versión. La primera se construye al crear el
+    administrador; las siguientes, en el hilo vigilante, recién cuando la versión del
+    origen se mantiene igual durante una revisión completa (el archivo pudo estar a
+    medio escribir). Si armar una versión falla se conserva la vigente y se registra el
+    error; se vuelve a intentar cuando el origen cambie otra vez.
+    """
+
+    def __init__(self, path: str, build, interval: float = INTERVAL):
+        self.path = path
+        self.build = build
+        self.interval = interval
+        self.error = None
+        self._pending = None
+        self._failed = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._current = self._build(1, storage.dataset_version(path))
+        self._thread = threading.Thread(target=self._watch, name="snapshot-loader", daemon=True)
+        self._thread.start()
+
+    def current(self) -> Snapshot:
+        return self._current
+
+    def _build(self, version: int, source: str) -> Snapshot:
+        t0 = time.perf_counter()
+        snapshot = Snapshot(version, source, self.build(self.path))
+        logger.info("snapshot %d de %s armado en %.2f s", version, self.path, time.perf_counter() - t0)
+        return snapshot
+
+    def poll(self) -> bool:
+        """Una revisión del origen; devuelve True si se publicó una versión nueva"""
+        with self._lock:
+            source = storage.dataset_version(self.path)
+            if source in (self._current.source, self._failed):
+                self._pending = None
+                return False
+            if source != self._pending:
+                # Recién cambió: se espera una revisión más antes de leerlo
+                self._pending = source
+                return False
+            self._pending = None
+            try:
+                snapshot = self._build(self._current.version + 1, source)
+            except Exception as exc:
+                self._failed, self.error = source, exc
+                logger.exception("no se pudo armar la nueva versión de %s; se mantiene la %d",
+                                 self.path, self._current.version)
+                return False
+            # Reemplazo atómico: las ejecuciones en curso conservan su referencia anterior
+            self._current, self.error = snapshot, None
+            return True
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except OSError:
+                # El origen puede faltar un instante mientras se reemplaza
+                logger.warning("no se pudo revisar %s", self.path, exc_info=True)
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
@@ -0,0 +1,194 @@
+# storage.py  (almacenamiento columnar del dataset de ventas)
+
+from __future__ import annotations
+
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+# Opciones del formato CSV histórico (se mantiene como ruta de importación)
+CSV_OPTIONS = {"sep": "\t", "encoding": "latin1"}
+
+# Extensiones soportadas, en orden de preferencia al buscar el dataset
+FORMATS = {".parquet": "parquet", ".feather": "feather", ".arrow": "feather", ".csv": "csv"}
+
+# Columnas que consume el dashboard (el resto no se lee del disco)
+DASHBOARD_COLUMNS = [
+    "fecha_venta",
+    "producto",
+    "categoria",
+    "precio",
+    "unidades_vendidas",
+    "satisfaccion_cliente",
+    "precio_homecenter",
+    "precio_amazon",
+    "precio_mercadolibre",
+]
+
+# Esquema compacto en memoria y en disco. Los enteros se reducen solo si el rango
+# cabe y los float32 solo si la conversión no pierde precisión (ver FLOAT32_TOLERANCE).
+# Precios, revenue y margen_porcentual quedan en float64: pandas acumula sumas y
+# promedios de float32 en float32 y los totales del dashboard cambiarían.
+SCHEMA = {
+    "producto": "category",
+    "categoria": "category",
+    "fuente_trafico": "category",
+    "disponibilidad_homecenter": "category",
+    "disponibilidad_amazon": "category",
+    "disponibilidad_mercadolibre": "category",
+    "satisfaccion_cliente": "int8",
+    "unidades_vendidas": "int16",
+    "calificacion_homecenter": "float32",
+    "calificacion_amazon": "float32",
+    "calificacion_mercadolibre": "float32",
+}
+
+CATEGORICAL_COLUMNS = [c for c, dtype in SCHEMA.items() if dtype == "category"]
+
+# Error absoluto admitido al pasar a float32 (por defecto, ninguno)
+FLOAT32_TOLERANCE = {
+    "calificacion_homecenter": 0.005,
+    "calificacion_amazon": 0.005,
+    "calificacion_mercadolibre": 0.005,
+}
+
+
+# Manifiesto de un dataset particionado (directorio con un Parquet por partición)
+MANIFEST = "_manifest.json"
+
+
+def detect_format(path: str) -> str:
+    """Devuelve 'partitioned', 'parquet', 'feather' o 'csv' según la ruta"""
+    if os.path.isdir(path):
+        return "partitioned"
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in FORMATS:
+        raise ValueError(f"Formato no soportado: {path}")
+    return FORMATS[ext]
+
+
+def find_dataset(base: str = "data_aug") -> str:
+    """Busca el dataset por nombre base: particionado, luego columnar y por último CSV"""
+    if os.path.exists(os.path.join(base, MANIFEST)):
+        return base
+    for ext in FORMATS:
+        if os.path.exists(base + ext):
+            return base + ext
+    return base + ".csv"
+
+
+def _fits(values: pd.Series, dtype: str) -> bool:
+    """Indica si `values` puede convertirse a `dtype` sin cambiar ningún valor"""
+    if values.isna().any():
+        return False
+    if values.empty:
+        return True
+    if dtype.startswith("int"):
+        info = np.iinfo(dtype)
+        return values.min() >= info.min and values.max() <= info.max and (values % 1 == 0).all()
+    x = values.to_numpy(dtype="float64")
+    error = np.abs(x.astype(dtype).astype("float64") - x)
+    return error.max() <= FLOAT32_TOLERANCE.get(values.name, 0.0)
+
+
+def compact(df: pd.DataFrame) -> pd.DataFrame:
+    """Aplica SCHEMA: texto a `category` y numéricos al menor tipo que conserva los valores.
+
+    La copia es superficial: las columnas que ya tienen el tipo de SCHEMA siguen apuntando
+    a los mismos buffers (p. ej. los mapeados del Parquet) y solo se reasignan las que cambian.
+    """
+    df = df.copy(deep=False)
+    for col, dtype in SCHEMA.items():
+        if col not in df or df[col].dtype == dtype:
+            continue
+        if dtype == "category":
+            df[col] = df[col].astype("category")
+        elif pd.api.types.is_numeric_dtype(df[col]) and _fits(df[col], dtype):
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+def memory_report(before: pd.DataFrame, after: pd.DataFrame) -> dict:
+    """Memoria (MB) antes y después de compactar"""
+    mb_before = before.memory_usage(deep=True).sum() / 2**20
+    mb_after = after.memory_usage(deep=True).sum() / 2**20
+    return {"before_mb": mb_before, "after_mb": mb_after, "saved_mb": mb_before - mb_after}
+
+
+def dataset_version(path: str) -> str:
+    """Identificador que cambia cada vez que se reescribe el dataset (o su manifiesto)"""
+    stat = os.stat(os.path.join(path, MANIFEST) if os.path.isdir(path) else path)
+    return f"{os.path.abspath(path)}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def parse_dates(values: pd.Series) -> pd.Series:
+    """Fechas del dataset convertido como datetime64.
+
+    data_convert escribe data_aug.csv con fechas ISO (AAAA-MM-DD); `dayfirst` solo
+    corresponde a data.csv original (DD/MM/AAAA), que se parsea en data_convert. Con
+    `dayfirst` pandas infiere %Y-%d-%m de la primera fecha ISO ambigua y descarta o
+    invierte el resto.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    return pd.to_datetime(values, format="ISO8601", errors="coerce")
+
+
+def to_storage_types(df: pd.DataFrame) -> pd.DataFrame:
+    """Tipa fechas y compacta columnas antes de escribir para no reparsear al cargar"""
+    df = compact(df)
+    if "fecha_venta" in df:
+        df["fecha_venta"] = parse_dates(df["fecha_venta"])
+    return df
+
+
+def write_dataset(df: pd.DataFrame, path: str) -> None:
+    """Escribe el dataset en el formato indicado por la extensión de `path`.
+
+    Se escribe en un archivo temporal que luego reemplaza a `path` de forma atómica:
+    quien lea `path` mientras tanto (p. ej. la recarga en segundo plano del dashboard)
+    ve la versión anterior completa o la nueva completa, nunca un archivo a medias.
+    """
+    fmt = detect_format(path)
+    tmp = path + ".tmp"
+    if fmt == "csv":
+        df.to_csv(tmp, index=False, **CSV_OPTIONS)
+    else:
+        table = pa.Table.from_pandas(to_storage_types(df), preserve_index=False)
+        if fmt == "parquet":
+            pq.write_table(table, tmp)
+        else:
+            # Sin compresión para que la lectura pueda mapear el archivo en memoria
+            feather.write_feather(table, tmp, compression="uncompressed")
+    os.replace(tmp, path)
+
+
+def column_names(path: str) -> list[str]:
+    """Columnas disponibles en el archivo, sin leer los datos"""
+    fmt = detect_format(path)
+    if fmt == "csv":
+        return list(pd.read_csv(path, nrows=0, **CSV_OPTIONS).columns)
+    if fmt == "parquet":
+        return pq.read_schema(path).names
+    return pa.ipc.open_file(pa.memory_map(path)).schema.names
+
+
+def read_dataset(path: str, columns: list[str] | None = None) -> pd.DataFrame:
+    """Lee el dataset proyectando solo `columns` (las que existan en el archivo)"""
+    fmt = detect_format(path)
+    if fmt == "csv":
+        usecols = None if columns is None else (lambda c: c in columns)
+        return pd.read_csv(path, usecols=usecols, **CSV_OPTIONS)
+    names = column_names(path)
+    cols = None if columns is None else [c for c in columns if c in names]
+    if fmt == "parquet":
+        table = pq.read_table(path, columns=cols, memory_map=True)
+    else:
+        table = feather.read_table(path, columns=cols, memory_map=True)
+    # split_blocks evita consolidar columnas: las numéricas sin nulos quedan sobre los
+    # buffers de Arrow (en Feather sin compresión, directamente sobre el archivo mapeado)
+    return table.to_pandas(split_blocks=True)
@@ -0,0 +1,77 @@
+# testkit.py  (utilidades compartidas por las pruebas y los benchmarks)
+#
+# Datos sintéticos con el esquema de data_aug.csv, comparación de paneles entre
+# motores y un cliente HTTP mínimo para la API. No lo usa el dashboard.
+
+import gzip
+import json
+from http.client import HTTPConnection
+
+import numpy as np
+import pandas as pd
+
+
+def synthetic_sales(n_rows: int, n_products: int = 2000, seed: int = 0) -> pd.DataFrame:
+    """Genera un dataset con el mismo esquema que data_aug.csv (texto ya como categóricas)"""
+    rng = np.random.default_rng(seed)
+    categories = ["Herramientas", "Pinturas", "Iluminación", "Baños", "Cocinas", "Jardín", "Pisos", "Electro"]
+    products = [f"Producto {i:06d}" for i in range(n_products)]
+    availability = ["Disponible", "Consultar", "Agotado", "Envío 24h"]
+    product_idx = rng.integers(0, n_products, n_rows)
+    precio = rng.integers(5, 2000, n_rows) * 1000.0 * rng.uniform(0.95, 1.05, n_rows)
+
+    def categorical(codes, values):
+        return pd.Categorical.from_codes(codes, categories=values)
+
+    return pd.DataFrame({
+        "fecha_venta": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 180, n_rows), unit="D"),
+        "producto": categorical(product_idx, products),
+        "categoria": categorical(product_idx % len(categories), categories),
+        "precio": precio,
+        "unidades_vendidas": rng.integers(1, 20, n_rows),
+        "fuente_trafico": categorical(rng.integers(0, 4, n_rows), ["Orgánico", "Ads", "Email", "Referido"]),
+        "satisfaccion_cliente": rng.choice([1, 2, 3, 4, 5], n_rows, p=[0.05, 0.05, 0.20, 0.40, 0.30]),
+        "precio_homecenter": precio,
+        "precio_amazon": precio * (1 - rng.uniform(0.05, 0.15, n_rows)),
+        "precio_mercadolibre": precio * (1 + rng.uniform(-0.10, 0.20, n_rows)),
+        "disponibilidad_homecenter": categorical(rng.integers(0, 4, n_rows), availability),
+        "disponibilidad_amazon": categorical(rng.integers(0, 4, n_rows), availability),
+        "disponibilidad_mercadolibre": categorical(rng.integers(0, 4, n_rows), availability),
+        "calificacion_homecenter": rng.normal(4.2, 0.8, n_rows).clip(1, 5).round(1),
+        "calificacion_amazon": rng.normal(4.4, 0.7, n_rows).clip(1, 5).round(1),
+        "calificacion_mercadolibre": rng.normal(4.0, 0.9, n_rows).clip(1, 5).round(1),
+    })
+
+
+def assert_same_panels(a: dict, b: dict) -> None:
+    """Compara los paneles de dos caminos de cálculo (valores, no tipos)"""
+    for key, value in a["kpis"].items():
+        assert np.isclose(value, b["kpis"][key], rtol=1e-9, equal_nan=True), key
+    for name in a:
+        if name == "kpis":
+            continue
+        left, right = a[name], b[name]
+        if isinstance(left, pd.Series):
+            np.testing.assert_array_equal(left.index.astype(int), right.index.astype(int))
+            np.testing.assert_allclose(left.to_numpy(float), right.to_numpy(float))
+            continue
+        assert list(left.columns) == list(right.columns), name
+        for col in left.columns:
+            if pd.api.types.is_numeric_dtype(left[col]):
+                np.testing.assert_allclose(left[col].to_numpy(float), right[col].to_numpy(float), rtol=1e-9, err_msg=name)
+            else:
+                assert left[col].astype(str).tolist() == right[col].astype(str).tolist(), (name, col)
+
+
+def http_get(port: int, path: str, headers: dict | None = None) -> tuple:
+    """(estado, encabezados, JSON o None) de un GET a la API local"""
+    conn = HTTPConnection("127.0.0.1", port, timeout=30)
+    try:
+        conn.request("GET", path, headers=headers or {})
+        resp = conn.getresponse()
+        body = resp.read()
+        if resp.getheader("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        return resp.status, dict(resp.getheaders()), json.loads(body) if body else None
+    finally:
+        conn.close()
@@ -0,0 +1,20 @@
+# conftest.py  (configuración compartida de las pruebas)
+#
+# Las pruebas usan datasets sintéticos chicos (unos miles de filas) con el mismo
+# esquema que data_aug.csv; las verificaciones a escala quedan en benchmarks/.
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from testkit import synthetic_sales  # noqa: E402
+
+
+@pytest.fixture
+def sales():
+    """Ventas sintéticas sin enriquecer (como las lee data_convert)"""
+    return synthetic_sales(5_000, n_products=300)
@@ -0,0 +1,59 @@
+# test_api.py  (API HTTP: respuestas, ETag y errores)
+
+import threading
+
+import pytest
+
+import api
+import ingest
+import storage
+from testkit import http_get
+
+OPTIONS = {"engine": "rollup", "approximate": False, "precision": 12}
+
+
+@pytest.fixture
+def server(tmp_path, sales):
+    path = str(tmp_path / "data_aug.parquet")
+    storage.write_dataset(ingest.enrich(sales), path)
+    server = api.make_server(path, port=0, workers=2, options=OPTIONS)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    server.service.manager.stop()
+
+
+def test_kpis_and_revalidation(server, sales):
+    status, headers, body = http_get(server.server_port, "/api/kpis")
+    assert status == 200
+    assert body["data"]["kpis"]["Units sold"] == sales["unidades_vendidas"].sum()
+    status, _, body = http_get(server.server_port, "/api/kpis", {"If-None-Match": headers["ETag"]})
+    assert (status, body) == (304, None)
+
+
+@pytest.mark.parametrize("path, status", [
+    ("/api/kpis?start=2024-13-01", 400),
+    ("/api/kpis?start=2024-03-01&end=2024-02-01", 400),
+    ("/api/top-products?top_n=0", 400),
+    ("/api/kpis?category=Nada", 400),
+    ("/api/nada", 404),
+])
+def test_invalid_requests(server, path, status):
+    got, headers, body = http_get(server.server_port, path)
+    assert got == status
+    assert "error" in body
+
+
+def test_internal_errors_are_json(server, monkeypatch):
+    def fail(*args):
+        raise RuntimeError("falla al armar la consulta")
+
+    monkeypatch.setattr(server.service, "_payload", fail)
+    status, headers, body = http_get(server.server_port, "/api/prices")
+    assert status == 500
+    assert headers["Cache-Control"] == "no-store"
+    assert body == {"error": "Error interno al responder la consulta (RuntimeError)"}
+    # El servidor sigue atendiendo
+    monkeypatch.undo()
+    assert http_get(server.server_port, "/api/prices")[0] == 200
@@ -0,0 +1,67 @@
+# test_app.py  (el dashboard completo con streamlit.testing)
+
+import re
+import time
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from conftest import ROOT, synthetic_sales
+
+import ingest
+import partitions
+import storage
+
+APP = f"{ROOT}/app.py"
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Directorio del dataset, con revisiones de versión rápidas"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("DASHBOARD_REFRESH_SECONDS", "0.05")
+    return tmp_path
+
+
+def units_sold(at: AppTest) -> int:
+    """Valor de la tarjeta 'Units sold'"""
+    for block in at.markdown:
+        match = re.search(r"<h3>Units sold</h3>\s*<h2>([\d,]+)</h2>", block.value)
+        if match:
+            return int(match.group(1).replace(",", ""))
+    raise AssertionError("no se encontró la tarjeta 'Units sold'")
+
+
+def run_until(at: AppTest, condition, timeout: float = 10.0) -> AppTest:
+    """Re-ejecuta la página hasta que `condition(at)` se cumpla (la recarga es en segundo plano)"""
+    deadline = time.monotonic() + timeout
+    while True:
+        at.run(timeout=60)
+        assert not at.exception, at.exception
+        if condition(at) or time.monotonic() > deadline:
+            return at
+        time.sleep(0.1)
+
+
+def test_rewritten_dataset_is_reloaded(workdir):
+    first, second = synthetic_sales(3_000, seed=0), synthetic_sales(4_000, seed=1)
+    storage.write_dataset(ingest.enrich(first), "data_aug.parquet")
+    at = run_until(AppTest.from_file(APP), lambda at: True)
+    assert units_sold(at) == first["unidades_vendidas"].sum()
+
+    storage.write_dataset(ingest.enrich(second), "data_aug.parquet")
+    expected = second["unidades_vendidas"].sum()
+    run_until(at, lambda at: units_sold(at) == expected)
+    assert units_sold(at) == expected
+
+
+def test_appended_partitions_show_up(workdir):
+    first, second = synthetic_sales(3_000, seed=0), synthetic_sales(2_000, seed=1)
+    partitions.append("data_aug", first)
+    at = run_until(AppTest.from_file(APP), lambda at: True)
+    assert units_sold(at) == first["unidades_vendidas"].sum()
+
+    partitions.append("data_aug", second)
+    expected = first["unidades_vendidas"].sum() + second["unidades_vendidas"].sum()
+    run_until(at, lambda at: units_sold(at) == expected)
+    assert units_sold(at) == expected
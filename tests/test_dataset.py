@@ -0,0 +1,45 @@
+# test_dataset.py  (índice de fechas contra el filtro con máscaras)
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import aggregations
+import dataset
+import ingest
+import storage
+
+
+@pytest.fixture
+def rows(sales):
+    df = storage.compact(ingest.enrich(sales)).sort_values("fecha_venta_dt", ignore_index=True)
+    return dataset.freeze(df)
+
+
+def test_slice_matches_filter_rows(rows):
+    index = dataset.DateIndex(rows)
+    days = np.sort(rows["fecha_venta_dt"].dt.normalize().unique())
+    categories = sorted(rows["categoria"].unique())
+    day = days[len(days) // 2]
+    before = days[0] - np.timedelta64(30, "D")
+    cases = [
+        (days[0], days[-1], "All"),
+        (days[0], days[-1], categories[0]),
+        (days[10], days[40], "All"),
+        (days[10], days[40], categories[-1]),
+        (day, day, "All"),
+        (day, day, categories[1]),
+        # Extremos fuera del dataset, como textos (así llegan desde la API) y sin ventas
+        (before, days[5], "All"),
+        (str(days[5])[:10], "2100-01-01", categories[2]),
+        (before, before + np.timedelta64(10, "D"), "All"),
+        (days[0], days[-1], "Nada"),
+    ]
+    for start, end, cat in cases:
+        pd.testing.assert_frame_equal(index.slice(rows, start, end, cat),
+                                      aggregations.filter_rows(rows, start, end, cat))
+
+
+def test_unsorted_rows_are_rejected(rows):
+    with pytest.raises(ValueError):
+        dataset.DateIndex(rows.iloc[::-1])
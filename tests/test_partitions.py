@@ -0,0 +1,35 @@
+# test_partitions.py  (dataset particionado e ingesta incremental)
+
+import aggregations
+import partitions
+import rollup
+
+
+def test_appended_parts_merge_into_one_cube(tmp_path, sales):
+    root = str(tmp_path / "data_aug")
+    cache = partitions.PartitionCache()
+    # Mismos días en las dos partes: sus grupos deben sumarse, no repetirse
+    partitions.append(root, sales.iloc[:3_000])
+    cache.load(root)
+    partitions.append(root, sales.iloc[3_000:])
+    df, cube = cache.load(root)
+
+    assert len(df) == len(sales)
+    assert len(cube) == len(rollup.build_cube(df))
+    assert not cube.duplicated(rollup.CUBE_KEYS).any()
+    start, end = df["fecha_venta_dt"].min(), df["fecha_venta_dt"].max()
+    expected = aggregations.compute_panels(aggregations.filter_rows(df, start, end))
+    actual = rollup.compute_panels(cube, start, end)
+    assert actual["kpis"] == expected["kpis"]
+
+
+def test_rewritten_manifest_reloads_everything(tmp_path, sales):
+    root = str(tmp_path / "data_aug")
+    cache = partitions.PartitionCache()
+    partitions.append(root, sales.iloc[:1_000])
+    cache.load(root)
+    (tmp_path / "data_aug" / "_manifest.json").unlink()
+    partitions.append(root, sales.iloc[1_000:1_500])
+    df, cube = cache.load(root)
+    assert len(df) == 500
+    assert cube["filas"].sum() == 500
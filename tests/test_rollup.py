@@ -0,0 +1,47 @@
+# test_rollup.py  (cubo diario contra el cálculo sobre las filas)
+
+import numpy as np
+import pytest
+
+import aggregations
+import ingest
+import rollup
+import storage
+from testkit import assert_same_panels
+
+
+@pytest.fixture
+def rows(sales):
+    return storage.compact(ingest.enrich(sales))
+
+
+def filters(df) -> list:
+    """Todo el rango, una categoría, un día (con y sin categoría) y rangos sin ventas"""
+    days = np.sort(df["fecha_venta_dt"].dt.normalize().unique())
+    categories = sorted(df["categoria"].unique())
+    day = days[len(days) // 2]
+    after = days[-1] + np.timedelta64(1, "D")
+    return [
+        (days[0], days[-1], "All"),
+        (days[0], days[-1], categories[0]),
+        (days[10], days[40], categories[-1]),
+        (day, day, "All"),
+        (day, day, categories[1]),
+        (after, after + np.timedelta64(30, "D"), "All"),
+        (days[0], days[-1], "Nada"),
+    ]
+
+
+def test_cube_matches_rows(rows):
+    cube = rollup.build_cube(rows)
+    for start, end, cat in filters(rows):
+        expected = aggregations.compute_panels(aggregations.filter_rows(rows, start, end, cat))
+        assert_same_panels(expected, rollup.compute_panels(cube, start, end, cat))
+
+
+def test_empty_range_has_no_rows(rows):
+    after = rows["fecha_venta_dt"].max() + np.timedelta64(1, "D")
+    panels = rollup.compute_panels(rollup.build_cube(rows), after, after + np.timedelta64(30, "D"))
+    assert panels["kpis"]["Units sold"] == panels["kpis"]["Unique products"] == 0
+    assert np.isnan(panels["kpis"]["Avg ticket"])
+    assert all(len(panel) == 0 for name, panel in panels.items() if name != "kpis")
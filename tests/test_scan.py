@@ -0,0 +1,59 @@
+# test_scan.py  (motor fuera de memoria contra el cálculo en pandas)
+
+import numpy as np
+import pytest
+
+import aggregations
+import dataset
+import ingest
+import partitions
+import scan
+import storage
+from testkit import assert_same_panels
+
+
+@pytest.fixture(params=["parquet", "feather", "partitioned"])
+def path(request, tmp_path, sales):
+    if request.param == "partitioned":
+        root = str(tmp_path / "data_aug")
+        for rows in np.array_split(np.arange(len(sales)), 3):
+            partitions.append(root, sales.iloc[rows])
+        return root
+    path = str(tmp_path / f"data_aug.{request.param}")
+    storage.write_dataset(ingest.enrich(sales), path)
+    return path
+
+
+def filters(engine: scan.ScanEngine) -> list:
+    """Todo el rango, un mes, una categoría, un día y un rango sin ventas"""
+    low, high = engine.min_date.normalize(), engine.max_date.normalize()
+    mid = (low + (high - low) / 2).normalize()
+    return [
+        (low, high, "All"),
+        (mid, mid + np.timedelta64(30, "D"), "All"),
+        (low, high, engine.categories[0]),
+        (mid, mid, "All"),
+        (mid, mid, engine.categories[-1]),
+        (high + np.timedelta64(1, "D"), high + np.timedelta64(10, "D"), "All"),
+    ]
+
+
+def test_scan_matches_pandas(path):
+    if storage.detect_format(path) == "partitioned":
+        df = partitions.PartitionCache().load(path)[0]
+    else:
+        df = dataset.freeze(ingest.load_dataset(path))
+    engine = scan.ScanEngine(path)
+    assert engine.min_date == df["fecha_venta_dt"].min()
+    assert engine.max_date == df["fecha_venta_dt"].max()
+    assert engine.categories == sorted(df["categoria"].unique())
+    for start, end, cat in filters(engine):
+        expected = aggregations.compute_panels(aggregations.filter_rows(df, start, end, cat))
+        actual = aggregations.panels_from_partials(engine.partials(start, end, cat))
+        if not expected["kpis"]["Units sold"]:
+            # Rango vacío: sin ticket promedio y sin filas en ningún panel
+            assert np.isnan(actual["kpis"]["Avg ticket"])
+            assert actual["kpis"]["Units sold"] == actual["kpis"]["Unique products"] == 0
+            assert all(len(panel) == 0 for name, panel in actual.items() if name != "kpis")
+            continue
+        assert_same_panels(expected, actual)
@@ -0,0 +1,77 @@
+# test_sketches.py  (KPIs aproximados con HyperLogLog)
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import ingest
+import rollup
+import sketches
+import storage
+from testkit import synthetic_sales
+
+PRECISION = 10
+
+
+@pytest.fixture(scope="module")
+def cube():
+    # Más productos que registros: la estimación no cae solo en el conteo lineal
+    df = storage.compact(ingest.enrich(synthetic_sales(30_000, n_products=8_000)))
+    return rollup.build_cube(df)
+
+
+def random_filters(cube: pd.DataFrame, n: int = 40, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    days = np.sort(cube["dia"].unique())
+    categories = sorted(cube["categoria"].unique())
+    out = []
+    for _ in range(n):
+        start, end = np.sort(rng.integers(0, len(days), 2))
+        out.append((days[start], days[end], categories[rng.integers(len(categories))] if rng.random() < 0.5 else "All"))
+    return out
+
+
+def test_kpis_within_stated_error(cube):
+    sketch = sketches.DistinctSketches(cube, PRECISION)
+    sigma = sketches.standard_error(PRECISION)
+    errors = []
+    for f in random_filters(cube):
+        exact = rollup.compute_panels(cube, *f)["kpis"]
+        approx = sketch.kpis(*f)
+        for key in ("Total revenue", "Units sold", "Avg ticket"):
+            assert np.isclose(approx[key], exact[key], rtol=1e-9, equal_nan=True), (f, key)
+        errors.append(abs(approx["Unique products"] / exact["Unique products"] - 1))
+    assert max(errors) <= 4 * sigma
+    assert np.mean(errors) <= 2 * sigma
+
+
+def test_empty_filter_has_no_products(cube):
+    kpis = sketches.DistinctSketches(cube, PRECISION).kpis("2000-01-01", "2000-01-02")
+    assert kpis["Unique products"] == 0
+    assert kpis["Units sold"] == 0
+
+
+def test_merge_is_order_independent(cube):
+    sketch = sketches.DistinctSketches(cube, PRECISION)
+    rng = np.random.default_rng(1)
+    rows = rng.choice(len(sketch.keys), size=len(sketch.keys) // 2, replace=False)
+    merged = sketch.registers[rows].max(axis=0)
+    assert np.array_equal(merged, sketch.registers[rng.permutation(rows)].max(axis=0))
+    # Unir dos mitades en cualquier orden da el sketch de la unión
+    half = len(rows) // 2
+    left, right = sketch.registers[rows[:half]].max(axis=0), sketch.registers[rows[half:]].max(axis=0)
+    assert np.array_equal(np.maximum(left, right), merged)
+    assert np.array_equal(np.maximum(right, left), merged)
+
+    # El orden de las filas del cubo no cambia ningún KPI
+    shuffled = sketches.DistinctSketches(cube.sample(frac=1, random_state=2).reset_index(drop=True), PRECISION)
+    for f in random_filters(cube, n=10):
+        assert shuffled.kpis(*f)["Unique products"] == sketch.kpis(*f)["Unique products"]
+
+
+def test_union_of_sketches_equals_sketch_of_all_products(cube):
+    sketch = sketches.DistinctSketches(cube, PRECISION)
+    products = cube["producto"].cat
+    catalog = pd.util.hash_array(products.categories.to_numpy(dtype=object))
+    whole = sketches.registers(np.zeros(len(cube), dtype="int64"), catalog[products.codes.to_numpy()], 1, PRECISION)
+    assert np.array_equal(sketch.registers.max(axis=0), whole[0])
@@ -0,0 +1,76 @@
+# test_storage.py  (formatos del dataset, tipos compactos y buffers de solo lectura)
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import aggregations
+import dataset
+import ingest
+import storage
+from testkit import assert_same_panels
+
+
+@pytest.fixture
+def enriched(sales):
+    # Texto como object, igual que una importación CSV sin compactar
+    return ingest.enrich(sales.astype({c: object for c in storage.CATEGORICAL_COLUMNS}))
+
+
+def filters(df: pd.DataFrame) -> list:
+    days = np.sort(df["fecha_venta_dt"].unique())
+    category = sorted(df["categoria"].unique())[0]
+    return [(days[0], days[-1], "All"), (days[len(days) // 3], days[2 * len(days) // 3], "All"),
+            (days[0], days[-1], category), (days[5], days[5], category)]
+
+
+@pytest.mark.parametrize("ext", [".csv", ".parquet", ".feather"])
+def test_every_format_loads_the_same_rows(tmp_path, sales, ext):
+    # El CSV empieza con una fecha ISO ambigua (día <= 12): no debe leerse como %Y-%d-%m
+    sales = sales.sort_values("fecha_venta", ignore_index=True)
+    path = str(tmp_path / f"data_aug{ext}")
+    storage.write_dataset(sales if ext == ".csv" else ingest.enrich(sales), path)
+    df = ingest.load_dataset(path)
+
+    assert len(df) == len(sales)
+    months = df["fecha_venta_dt"].dt.strftime("%Y-%m")
+    expected = sales.groupby(sales["fecha_venta"].dt.strftime("%Y-%m"))["unidades_vendidas"].sum()
+    pd.testing.assert_series_equal(df.groupby(months)["unidades_vendidas"].sum(), expected,
+                                   check_names=False, check_dtype=False)
+
+
+def test_compact_and_freeze_keep_every_panel(enriched):
+    compacted = storage.compact(enriched)
+    assert storage.memory_report(enriched, compacted)["saved_mb"] > 0
+    assert all(isinstance(compacted[c].dtype, pd.CategoricalDtype)
+               for c in storage.CATEGORICAL_COLUMNS if c in compacted)
+    frozen = dataset.freeze(storage.compact(enriched))
+    for f in filters(enriched):
+        expected = aggregations.compute_panels(aggregations.filter_rows(enriched, *f))
+        for df in (compacted, frozen):
+            assert_same_panels(expected, aggregations.compute_panels(aggregations.filter_rows(df, *f)))
+
+
+def test_frozen_buffers_reject_writes(enriched):
+    frozen = dataset.freeze(storage.compact(enriched))
+    with pytest.raises(ValueError):
+        frozen.loc[0, "precio"] = 1.0
+    with pytest.raises(ValueError):
+        frozen["precio"].to_numpy()[0] = 1.0
+    with pytest.raises(ValueError):
+        frozen["unidades_vendidas"].to_numpy()[:] = 0
+    with pytest.raises(ValueError):
+        frozen["fecha_venta_dt"].to_numpy()[0] = np.datetime64("2000-01-01")
+
+
+def test_compact_shares_columns_that_already_match(tmp_path, sales):
+    path = str(tmp_path / "data_aug.parquet")
+    storage.write_dataset(ingest.enrich(sales), path)
+    df = storage.read_dataset(path)
+    compacted = storage.compact(df)
+    for col in ("precio", "unidades_vendidas", "fecha_venta_dt"):
+        assert np.shares_memory(df[col].to_numpy(), compacted[col].to_numpy()), col
+    # Convertir una columna en la copia no modifica el original
+    mixed = ingest.enrich(sales.astype({"producto": object}))
+    assert storage.compact(mixed)["producto"].dtype == "category"
+    assert mixed["producto"].dtype == object
@@ -0,0 +1,101 @@
+# test_synthetic.py  (generación reproducible de data_convert.py)
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import aggregations
+import data_convert
+import ingest
+import partitions
+import rollup
+import scan
+import storage
+from testkit import assert_same_panels, synthetic_sales
+
+# Columnas originales de data.csv (el resto las agrega data_convert.py)
+SOURCE_COLUMNS = ["fecha_venta", "producto", "categoria", "precio", "unidades_vendidas", "fuente_trafico"]
+
+
+@pytest.fixture
+def source(tmp_path, monkeypatch):
+    """data.csv con varios bloques chicos, para variar chunks y workers sin millones de filas"""
+    monkeypatch.setattr(data_convert, "BLOCK_ROWS", 512)
+    raw = synthetic_sales(2_000, n_products=200)[SOURCE_COLUMNS]
+    raw["fecha_venta"] = raw["fecha_venta"].dt.strftime("%d/%m/%Y")
+    path = str(tmp_path / "data.csv")
+    raw.to_csv(path, index=False, **storage.CSV_OPTIONS)
+    return path
+
+
+def test_draws_depend_only_on_seed_and_block():
+    a = data_convert.draw_synthetic(data_convert.block_rng(42, 0), 1_000)
+    b = data_convert.draw_synthetic(data_convert.block_rng(42, 0), 1_000)
+    assert all(np.array_equal(a[key], b[key]) for key in a)
+    for other in (data_convert.block_rng(43, 0), data_convert.block_rng(42, 1)):
+        assert not np.array_equal(a["satisfaccion"], data_convert.draw_synthetic(other, 1_000)["satisfaccion"])
+
+
+def test_streaming_matches_batch_for_any_chunk_size(tmp_path, source):
+    batch = data_convert.generate(pd.read_csv(source, **storage.CSV_OPTIONS), seed=42)
+    pd.testing.assert_frame_equal(batch, data_convert.generate(pd.read_csv(source, **storage.CSV_OPTIONS), seed=42))
+    batch_csv = str(tmp_path / "batch.csv")
+    batch.to_csv(batch_csv, sep="\t", index=False, encoding="latin1")
+    with open(batch_csv, "rb") as fh:
+        expected = fh.read()
+
+    parquets = []
+    for chunk_rows in (512, 1_024, 4_096):
+        csv_path, parquet_path = str(tmp_path / f"{chunk_rows}.csv"), str(tmp_path / f"{chunk_rows}.parquet")
+        total = data_convert.generate_streaming(source, 42, chunk_rows, csv_path=csv_path, parquet_path=parquet_path)
+        assert total == len(batch)
+        with open(csv_path, "rb") as fh:
+            assert fh.read() == expected, f"chunks de {chunk_rows} filas"
+        parquets.append(storage.read_dataset(parquet_path))
+    for other in parquets[1:]:
+        pd.testing.assert_frame_equal(parquets[0], other)
+
+    # Mismo esquema en disco que el camino batch: el motor fuera de memoria lo lee igual
+    batch_parquet = str(tmp_path / "batch.parquet")
+    storage.write_dataset(ingest.enrich(batch), batch_parquet)
+    pd.testing.assert_frame_equal(ingest.load_dataset(batch_parquet), ingest.load_dataset(parquet_path))
+    expected, streamed = scan.ScanEngine(batch_parquet), scan.ScanEngine(parquet_path)
+    assert streamed.categories == expected.categories
+    start, end = streamed.min_date, streamed.max_date
+    assert_same_panels(aggregations.panels_from_partials(expected.partials(start, end, "All")),
+                       aggregations.panels_from_partials(streamed.partials(start, end, "All")))
+
+
+def test_chunk_rows_rounds_to_whole_blocks(source):
+    assert data_convert.block_chunk_rows(100) == 512
+    assert data_convert.block_chunk_rows(1_500) == 1_024
+    assert data_convert.block_chunk_rows(2_048) == 2_048
+
+
+def test_parallel_matches_for_any_worker_count(tmp_path, source):
+    loaded = []
+    for workers in (1, 3):
+        output = str(tmp_path / f"data_aug_{workers}")
+        parts = data_convert.generate_parallel(source, 10_000, seed=42, workers=workers, output=output)
+        # Los workers escriben las partes finales: en el directorio no queda nada más
+        written = {f"{folder}/{name}" for folder in os.listdir(output) if folder != storage.MANIFEST
+                   for name in os.listdir(os.path.join(output, folder))}
+        assert written == {part[key] for part in parts for key in ("file", "cube")}
+        assert partitions.read_manifest(output)["parts"] == parts
+        loaded.append(partitions.PartitionCache().load(output))
+    (df, cube), (other_df, other_cube) = loaded
+    assert len(df) == 10_000
+    # Un grupo por (día, categoría, producto) aunque el mes venga de varios bloques
+    assert not cube.duplicated(rollup.CUBE_KEYS).any()
+    pd.testing.assert_frame_equal(df, other_df)
+    pd.testing.assert_frame_equal(cube, other_cube)
+
+
+def test_append_requires_partitioned_dataset(tmp_path, source, monkeypatch):
+    output = str(tmp_path / "data_aug")
+    monkeypatch.setattr("sys.argv", ["data_convert.py", "--append", source, "--output", output])
+    with pytest.raises(SystemExit):
+        data_convert.main()
+    assert not os.path.exists(output)